@@ -258,7 +258,8 @@ Rectangle {
                         const b = root.blocks[i]
                         if ((b?.type ?? "") !== "message") continue
                         const role = b?.role ?? ""
-                        const content = b?.content ?? ""
+                        const content = (b?.content ?? "").trim()
+                        if (content === "") continue
                         out += `${role}: ${content}\n\n`
                     }
                     return out.trim()
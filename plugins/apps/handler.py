@@ -11,15 +11,31 @@ Features:
 
 import json
 import os
-import subprocess
+import pickle
+import stat
 import sys
-from configparser import ConfigParser
+import time
+from collections.abc import Iterable
+from itertools import islice
 from pathlib import Path
 
 # Search history path (same as LauncherSearch.qml)
 HAMR_CONFIG = Path.home() / ".config" / "hamr"
 HISTORY_PATH = HAMR_CONFIG / "search-history.json"
 
+# Parsed app list and history are cached between invocations, keyed by mtime
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "hamr"
+APPS_CACHE_PATH = CACHE_DIR / "apps.pickle"
+# Bump when the shape of cached app dicts changes
+APPS_CACHE_VERSION = 3
+HISTORY_CACHE_PATH = CACHE_DIR / "apps-history.pickle"
+
+# Daemon mode: how often to re-check desktop dirs and history for changes
+CATALOG_RECHECK_SECONDS = 2.0
+_catalog: dict | None = None
+_catalog_key = None
+_catalog_checked = 0.0
+
 # XDG application directories
 APP_DIRS = [
     Path.home() / ".local/share/applications",
@@ -47,6 +63,23 @@ CATEGORY_MAP = {
     "Utility": "Utilities",
 }
 
+# Display order for categories; anything else follows alphabetically
+CATEGORY_PRIORITY = (
+    "Internet",
+    "Development",
+    "Media",
+    "Graphics",
+    "Office",
+    "Games",
+    "System",
+    "Utilities",
+    "Settings",
+    "Education",
+    "Science",
+    "Other",
+)
+CATEGORY_PRIORITY_INDEX = {name: i for i, name in enumerate(CATEGORY_PRIORITY)}
+
 # Category icons
 CATEGORY_ICONS = {
     "All": "apps",
@@ -65,17 +98,45 @@ CATEGORY_ICONS = {
 }
 
 
-def parse_desktop_file(path: Path) -> dict | None:
+def read_desktop_sections(path: str) -> dict[str, dict[str, str]]:
+    """Read the [Desktop Entry] and [Desktop Action *] groups of a .desktop file"""
+    with open(path, "rb") as f:
+        data = f.read()
+
+    start = data.find(b"[Desktop Entry]")
+    if start < 0:
+        return {}
+
+    sections: dict[str, dict[str, str]] = {}
+    current = None
+    for line in data[start:].decode("utf-8").splitlines():
+        line = line.strip()
+        if not line or line[0] in "#;":
+            continue
+        if line[0] == "[" and line[-1] == "]":
+            name = line[1:-1]
+            if name == "Desktop Entry" or name.startswith("Desktop Action "):
+                current = sections.setdefault(name, {})
+            else:
+                current = None
+            continue
+        if current is None:
+            continue
+        key, sep, value = line.partition("=")
+        if sep:
+            current.setdefault(key.rstrip(), value.lstrip())
+    return sections
+
+
+def parse_desktop_file(path: str) -> dict | None:
     """Parse a .desktop file and return app info"""
     try:
-        config = ConfigParser(interpolation=None)
-        config.read(path, encoding="utf-8")
+        sections = read_desktop_sections(path)
 
-        if not config.has_section("Desktop Entry"):
+        entry = sections.get("Desktop Entry")
+        if entry is None:
             return None
 
-        entry = config["Desktop Entry"]
-
         if entry.get("Type", "") != "Application":
             return None
         if entry.get("NoDisplay", "").lower() == "true":
@@ -103,9 +164,8 @@ def parse_desktop_file(path: Path) -> dict | None:
         action_ids = [a.strip() for a in actions_str.split(";") if a.strip()]
         desktop_actions = []
         for action_id in action_ids:
-            section_name = f"Desktop Action {action_id}"
-            if config.has_section(section_name):
-                action_section = config[section_name]
+            action_section = sections.get(f"Desktop Action {action_id}")
+            if action_section is not None:
                 action_name = action_section.get("Name", action_id)
                 action_exec = action_section.get("Exec", "")
                 action_exec_clean = " ".join(
@@ -123,7 +183,7 @@ def parse_desktop_file(path: Path) -> dict | None:
                     )
 
         return {
-            "id": str(path),
+            "id": path,
             "name": name,
             "generic_name": entry.get("GenericName", ""),
             "comment": entry.get("Comment", ""),
@@ -139,82 +199,170 @@ def parse_desktop_file(path: Path) -> dict | None:
         return None
 
 
-def load_all_apps() -> list[dict]:
-    """Load all applications from .desktop files"""
-    apps = {}  # Use dict to dedupe by file path
+def scan_desktop_files() -> tuple:
+    """(path, mtime_ns, size) of every .desktop file in APP_DIRS.
 
+    Used as the cache key, so editing a file in place (which leaves the
+    directory mtime alone) still invalidates the parsed apps.
+    """
+    desktop_files = []
     for app_dir in APP_DIRS:
-        if not app_dir.exists():
+        try:
+            with os.scandir(app_dir) as it:
+                for e in it:
+                    if not e.name.endswith(".desktop"):
+                        continue
+                    # stat() follows symlinks - flatpak exports are symlinked
+                    try:
+                        st = e.stat()
+                    except OSError:
+                        continue
+                    if stat.S_ISREG(st.st_mode):
+                        desktop_files.append((e.path, st.st_mtime_ns, st.st_size))
+        except OSError:
             continue
-        for desktop_file in app_dir.glob("*.desktop"):
-            app = parse_desktop_file(desktop_file)
-            if app:
-                # Dedupe by file path (id) - each .desktop file is unique
-                if app["id"] not in apps:
-                    apps[app["id"]] = app
+    return tuple(desktop_files)
+
+
+def load_all_apps(desktop_files: Iterable[str]) -> list[dict]:
+    """Load all applications from the given .desktop files"""
+    # Only needed on a cache miss, so keep it off the startup path
+    from concurrent.futures import ThreadPoolExecutor
+
+    apps = {}  # Use dict to dedupe by file path
+
+    # Parsing is I/O bound (file reads release the GIL), so overlap it
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        parsed = executor.map(parse_desktop_file, desktop_files)
+
+    for app in parsed:
+        if app:
+            # Dedupe by file path (id) - each .desktop file is unique
+            if app["id"] not in apps:
+                # Lowercased once here so search never re-lowercases
+                app["_name_lc"] = app["name"].lower()
+                app["_generic_lc"] = app["generic_name"].lower()
+                app["_keywords_lc"] = app["keywords"].lower()
+                app["_mask"] = char_mask(
+                    app["_name_lc"] + app["_generic_lc"] + app["_keywords_lc"]
+                )
+                apps[app["id"]] = app
 
     return list(apps.values())
 
 
-def load_app_frecency() -> dict[str, float]:
-    """Load frecency scores from search history"""
-    frecency = {}
-    if not HISTORY_PATH.exists():
-        return frecency
+def read_cache(path: Path, key):
+    """Return cached data if it was stored under the given key, else None"""
+    try:
+        with open(path, "rb") as f:
+            cached_key, data = pickle.load(f)
+    except Exception:
+        return None
+    return data if cached_key == key else None
+
+
+def write_cache(path: Path, key, data) -> None:
+    """Store data alongside the key (source mtime) it was built from"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump((key, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def load_all_apps_cached(desktop_files: tuple) -> list[dict]:
+    """Load applications, reusing the cached list while the files are unchanged"""
+    key = (APPS_CACHE_VERSION, desktop_files)
+    apps = read_cache(APPS_CACHE_PATH, key)
+    if apps is None:
+        apps = load_all_apps(path for path, _, _ in desktop_files)
+        write_cache(APPS_CACHE_PATH, key, apps)
+    return apps
+
+
+def load_app_history() -> list[dict]:
+    """Load app entries from search history, cached by history file mtime"""
+    try:
+        mtime = HISTORY_PATH.stat().st_mtime
+    except OSError:
+        return []
+
+    history = read_cache(HISTORY_CACHE_PATH, mtime)
+    if history is not None:
+        return history
 
     try:
         with open(HISTORY_PATH) as f:
             data = json.load(f)
-            history = data.get("history", [])
-            now = __import__("time").time() * 1000
-
-            for h in history:
-                if h.get("type") != "app":
-                    continue
-                name = h.get("name", "")
-                if not name:
-                    continue
-
-                # Calculate frecency
-                hours_since = (now - h.get("lastUsed", 0)) / (1000 * 60 * 60)
-                if hours_since < 1:
-                    mult = 4
-                elif hours_since < 24:
-                    mult = 2
-                elif hours_since < 168:
-                    mult = 1
-                else:
-                    mult = 0.5
-                frecency[name] = h.get("count", 1) * mult
+        history = [
+            {
+                "name": h["name"],
+                "count": h.get("count", 1),
+                "lastUsed": h.get("lastUsed", 0),
+            }
+            for h in data.get("history", [])
+            if h.get("type") == "app" and h.get("name")
+        ]
     except Exception:
-        pass
+        return []
+
+    write_cache(HISTORY_CACHE_PATH, mtime, history)
+    return history
+
+
+def load_app_frecency() -> dict[str, float]:
+    """Load frecency scores from search history"""
+    frecency = {}
+    now = time.time() * 1000
+
+    for h in load_app_history():
+        # Calculate frecency
+        hours_since = (now - h["lastUsed"]) / (1000 * 60 * 60)
+        if hours_since < 1:
+            mult = 4
+        elif hours_since < 24:
+            mult = 2
+        elif hours_since < 168:
+            mult = 1
+        else:
+            mult = 0.5
+        frecency[h["name"]] = h["count"] * mult
 
     return frecency
 
 
-def fuzzy_match(query: str, text: str) -> bool:
-    """Fuzzy match - query is substring or all chars appear in order with reasonable gaps"""
-    query = query.lower()
-    text = text.lower()
+def char_mask(text: str) -> int:
+    """Bitmask of characters present in text (code points folded into 128 bits)"""
+    mask = 0
+    for char in set(text):
+        mask |= 1 << (ord(char) & 127)
+    return mask
 
+
+def fuzzy_match_lower(query: str, text: str) -> bool:
+    """Fuzzy match on already-lowercased strings - query is substring or all
+    chars appear in order with reasonable gaps"""
     # Direct substring match
     if query in text:
         return True
 
-    # Fuzzy: all query chars appear in order, but penalize large gaps
-    qi = 0
-    last_match = -1
+    # Fuzzy: all query chars appear in order, but penalize large gaps.
+    # str.find does the scanning in C; the first char may be anywhere,
+    # each following char must appear within max_gap of the previous one.
     max_gap = 5  # Max chars between matches
 
-    for i, char in enumerate(text):
-        if qi < len(query) and char == query[qi]:
-            # Check gap from last match
-            if last_match >= 0 and (i - last_match) > max_gap:
-                return False
-            last_match = i
-            qi += 1
+    last_match = text.find(query[0])
+    if last_match < 0:
+        return False
+    for char in query[1:]:
+        last_match = text.find(char, last_match + 1, last_match + max_gap + 1)
+        if last_match < 0:
+            return False
 
-    return qi == len(query)
+    return True
 
 
 def app_to_index_item(app: dict) -> dict:
@@ -338,54 +486,203 @@ def app_to_result(app: dict, show_category: bool = False) -> dict:
     return result
 
 
-def get_categories(apps: list[dict]) -> list[str]:
-    """Get sorted list of categories with apps"""
-    categories = set()
-    for app in apps:
-        categories.add(app.get("display_category", "Other"))
-
-    # Sort with common categories first
-    priority = [
-        "Internet",
-        "Development",
-        "Media",
-        "Graphics",
-        "Office",
-        "Games",
-        "System",
-        "Utilities",
-        "Settings",
-        "Education",
-        "Science",
-        "Other",
+def index_by_category(apps: list[dict]) -> dict[str, list[int]]:
+    """Map each display category to the indices of its apps"""
+    by_cat: dict[str, list[int]] = {}
+    for i, app in enumerate(apps):
+        by_cat.setdefault(app.get("display_category", "Other"), []).append(i)
+    return by_cat
+
+
+def render_categories(
+    cat_counts: dict[str, int], categories: list[str], total: int
+) -> list[dict]:
+    """Build the category list results, "All Applications" first"""
+    results = [
+        {
+            "id": "__cat__:All",
+            "name": "All Applications",
+            "description": f"{total} apps",
+            "icon": "apps",
+        }
     ]
-    result = []
-    for cat in priority:
-        if cat in categories:
-            result.append(cat)
-            categories.discard(cat)
-    result.extend(sorted(categories))
-    return result
+    for cat in categories:
+        results.append(
+            {
+                "id": f"__cat__:{cat}",
+                "name": cat,
+                "description": f"{cat_counts.get(cat, 0)} apps",
+                "icon": CATEGORY_ICONS.get(cat, "folder"),
+            }
+        )
+    return results
 
 
-def main():
-    input_data = json.load(sys.stdin)
-    step = input_data.get("step", "initial")
-    query = input_data.get("query", "").strip()
-    selected = input_data.get("selected", {})
-    context = input_data.get("context", "")  # Current category
+def get_categories(cats: Iterable[str]) -> list[str]:
+    """Sort the given category names, common categories first"""
+    return sorted(cats, key=lambda c: (CATEGORY_PRIORITY_INDEX.get(c, 999), c))
 
-    selected_id = selected.get("id", "")
 
-    # Load all apps
-    all_apps = load_all_apps()
+def emit(response: dict):
+    """Write a JSON response to stdout as a single compact write"""
+    sys.stdout.write(json.dumps(response, separators=(",", ":"), ensure_ascii=False))
+
+
+def load_launchable_app(path: str) -> dict | None:
+    """Parse path only if it is a .desktop file directly inside APP_DIRS.
+
+    Launch ids come from the request, so an arbitrary path is never run,
+    but checking one file doesn't need the whole catalog.
+    """
+    if not path.endswith(".desktop") or os.path.normpath(path) != path:
+        return None
+    if Path(path).parent not in APP_DIRS or not os.path.isfile(path):
+        return None
+    return parse_desktop_file(path)
+
+
+def launch_desktop_action(selected_id: str):
+    """Run a desktop action - id format: __action__:<desktop_path>:<action_id>"""
+    parts = selected_id.split(":", 2)
+    if len(parts) == 3:
+        desktop_path = parts[1]
+        action_id = parts[2]
+
+        app = load_launchable_app(desktop_path)
+        if app:
+            action = None
+            for act in app.get("actions", []):
+                if act["id"] == action_id:
+                    action = act
+                    break
+
+            if action:
+                # Execute the action's command
+                exec_parts = action["exec"].split()
+                emit(
+                    {
+                        "type": "execute",
+                        "execute": {
+                            "command": exec_parts,
+                            "name": f"{app['name']}: {action['name']}",
+                            "icon": action.get("icon") or app["icon"],
+                            "iconType": "system",
+                            "close": True,
+                        },
+                    }
+                )
+                return
+
+    emit({"type": "error", "message": "Action not found"})
+
+
+def launch_app(selected_id: str):
+    """Launch the app whose .desktop path is selected_id"""
+    app = load_launchable_app(selected_id)
+
+    if app:
+        # Use gio launch with full path - more reliable than gtk-launch
+        # especially for Flatpak apps with .desktop.desktop naming
+        emit(
+            {
+                "type": "execute",
+                "execute": {
+                    "command": ["gio", "launch", selected_id],
+                    "name": f"Launch {app['name']}",
+                    "icon": app["icon"],
+                    "iconType": "system",  # App icons are system icons
+                    "close": True,
+                },
+            }
+        )
+    else:
+        emit({"type": "error", "message": f"App not found: {selected_id}"})
+
+
+def get_catalog() -> dict:
+    """Return apps sorted by frecency plus category indexes.
+
+    Kept in memory between requests in daemon mode. Desktop dirs and
+    history are re-stat'ed at most every CATALOG_RECHECK_SECONDS.
+    """
+    global _catalog, _catalog_key, _catalog_checked
+
+    now = time.monotonic()
+    if _catalog is not None and now - _catalog_checked < CATALOG_RECHECK_SECONDS:
+        return _catalog
+    _catalog_checked = now
+
+    try:
+        history_mtime = HISTORY_PATH.stat().st_mtime
+    except OSError:
+        history_mtime = 0
+    desktop_files = scan_desktop_files()
+    # Frecency decays with time, so also rebuild at least hourly
+    key = (desktop_files, history_mtime, int(time.time() // 3600))
+    if _catalog is not None and key == _catalog_key:
+        return _catalog
+
+    all_apps = load_all_apps_cached(desktop_files)
     frecency = load_app_frecency()
 
     # Sort apps by frecency then name
     def sort_key(app):
-        return (-frecency.get(app["name"], 0), app["name"].lower())
+        return (-frecency.get(app["name"], 0), app["_name_lc"])
 
     all_apps.sort(key=sort_key)
+    by_cat = index_by_category(all_apps)
+    _catalog = {
+        "apps": all_apps,
+        "by_cat": by_cat,
+        "cat_counts": {cat: len(indices) for cat, indices in by_cat.items()},
+        "categories": get_categories(by_cat.keys()),
+    }
+    _catalog_key = key
+    return _catalog
+
+
+def handle(input_data: dict):
+    step = input_data.get("step", "initial")
+    query = input_data.get("query", "").strip()
+    selected = input_data.get("selected", {})
+    context = input_data.get("context", "")  # Current category
+
+    selected_id = selected.get("id", "")
+
+    # Launches only need the selected .desktop file, not the catalog
+    if step == "action" and selected_id.startswith("__action__:"):
+        launch_desktop_action(selected_id)
+        return
+    if step == "action" and not selected_id.startswith("__"):
+        launch_app(selected_id)
+        return
+
+    catalog = get_catalog()
+    all_apps = catalog["apps"]
+    by_cat = catalog["by_cat"]
+    cat_counts = catalog["cat_counts"]
+    categories = catalog["categories"]
+
+    def search_apps(indices, limit: int = 50) -> list[dict]:
+        """Fuzzy filter apps at the given indices, keeping frecency order.
+
+        Matching stops as soon as `limit` apps are found.
+        """
+        q = query.lower()
+        q_mask = char_mask(q)
+        apps = (all_apps[i] for i in indices)
+        matches = (
+            a
+            for a in apps
+            # Reject apps missing any query character with one integer AND
+            if not q_mask & ~a["_mask"]
+            and (
+                fuzzy_match_lower(q, a["_name_lc"])
+                or fuzzy_match_lower(q, a["_generic_lc"])
+                or fuzzy_match_lower(q, a["_keywords_lc"])
+            )
+        )
+        return list(islice(matches, limit))
 
     if step == "index":
         mode = input_data.get("mode", "full")
@@ -408,52 +705,30 @@ def main():
             # Find removed items
             removed_ids = list(indexed_ids - current_ids)
 
-            print(
-                json.dumps(
-                    {
-                        "type": "index",
-                        "mode": "incremental",
-                        "items": new_items,
-                        "remove": removed_ids,
-                    }
-                )
+            emit(
+                {
+                    "type": "index",
+                    "mode": "incremental",
+                    "items": new_items,
+                    "remove": removed_ids,
+                }
             )
         else:
             # Full reindex
             items = [app_to_index_item(app) for app in all_apps]
-            print(json.dumps({"type": "index", "items": items}))
+            emit({"type": "index", "items": items})
         return
 
     if step == "initial":
-        categories = get_categories(all_apps)
-        results = [
+        results = render_categories(cat_counts, categories, len(all_apps))
+
+        emit(
             {
-                "id": "__cat__:All",
-                "name": "All Applications",
-                "description": f"{len(all_apps)} apps",
-                "icon": "apps",
+                "type": "results",
+                "results": results,
+                "inputMode": "realtime",
+                "placeholder": "Search apps or select category...",
             }
-        ]
-        for cat in categories:
-            count = sum(1 for a in all_apps if a.get("display_category") == cat)
-            results.append(
-                {
-                    "id": f"__cat__:{cat}",
-                    "name": cat,
-                    "description": f"{count} apps",
-                    "icon": CATEGORY_ICONS.get(cat, "folder"),
-                }
-            )
-
-        print(
-            json.dumps(
-                {
-                    "type": "results",
-                    "results": results,
-                    "inputMode": "realtime",
-                    "placeholder": "Search apps or select category...",
-                }
-            )
         )
         return
 
@@ -462,19 +737,15 @@ def main():
         if context and context.startswith("__cat__:"):
             category = context.replace("__cat__:", "")
             if category == "All":
-                apps = all_apps
+                indices = range(len(all_apps))
             else:
-                apps = [a for a in all_apps if a.get("display_category") == category]
+                indices = by_cat.get(category, [])
 
             # Filter by query
             if query:
-                apps = [
-                    a
-                    for a in apps
-                    if fuzzy_match(query, a["name"])
-                    or fuzzy_match(query, a.get("generic_name", ""))
-                    or fuzzy_match(query, a.get("keywords", ""))
-                ]
+                apps = search_apps(indices)
+            else:
+                apps = [all_apps[i] for i in islice(indices, 50)]
 
             results = [
                 app_to_result(a, show_category=(category == "All")) for a in apps[:50]
@@ -491,31 +762,23 @@ def main():
                     }
                 ]
 
-            print(
-                json.dumps(
-                    {
-                        "type": "results",
-                        "results": results,
-                        "inputMode": "realtime",
-                        "placeholder": f"Search in {category}..."
-                        if category != "All"
-                        else "Search all apps...",
-                        "context": context,
-                    }
-                )
+            emit(
+                {
+                    "type": "results",
+                    "results": results,
+                    "inputMode": "realtime",
+                    "placeholder": f"Search in {category}..."
+                    if category != "All"
+                    else "Search all apps...",
+                    "context": context,
+                }
             )
             return
 
         # Not in category context - search all or show categories
         if query:
             # Search all apps
-            apps = [
-                a
-                for a in all_apps
-                if fuzzy_match(query, a["name"])
-                or fuzzy_match(query, a.get("generic_name", ""))
-                or fuzzy_match(query, a.get("keywords", ""))
-            ]
+            apps = search_apps(range(len(all_apps)))
 
             results = [app_to_result(a, show_category=True) for a in apps[:50]]
 
@@ -528,189 +791,100 @@ def main():
                     }
                 ]
 
-            print(
-                json.dumps(
-                    {
-                        "type": "results",
-                        "results": results,
-                        "inputMode": "realtime",
-                        "placeholder": "Search apps or select category...",
-                    }
-                )
+            emit(
+                {
+                    "type": "results",
+                    "results": results,
+                    "inputMode": "realtime",
+                    "placeholder": "Search apps or select category...",
+                }
             )
         else:
             # Show categories
-            categories = get_categories(all_apps)
-            results = [
+            results = render_categories(cat_counts, categories, len(all_apps))
+
+            emit(
                 {
-                    "id": "__cat__:All",
-                    "name": "All Applications",
-                    "description": f"{len(all_apps)} apps",
-                    "icon": "apps",
+                    "type": "results",
+                    "results": results,
+                    "inputMode": "realtime",
+                    "placeholder": "Search apps or select category...",
                 }
-            ]
-            for cat in categories:
-                count = sum(1 for a in all_apps if a.get("display_category") == cat)
-                results.append(
-                    {
-                        "id": f"__cat__:{cat}",
-                        "name": cat,
-                        "description": f"{count} apps",
-                        "icon": CATEGORY_ICONS.get(cat, "folder"),
-                    }
-                )
-
-            print(
-                json.dumps(
-                    {
-                        "type": "results",
-                        "results": results,
-                        "inputMode": "realtime",
-                        "placeholder": "Search apps or select category...",
-                    }
-                )
             )
         return
 
     if step == "action":
         if selected_id == "__back__":
-            categories = get_categories(all_apps)
-            results = [
+            results = render_categories(cat_counts, categories, len(all_apps))
+
+            emit(
                 {
-                    "id": "__cat__:All",
-                    "name": "All Applications",
-                    "description": f"{len(all_apps)} apps",
-                    "icon": "apps",
+                    "type": "results",
+                    "results": results,
+                    "inputMode": "realtime",
+                    "placeholder": "Search apps or select category...",
+                    "clearInput": True,
+                    "context": "",  # Clear context
+                    "navigateBack": True,  # Going back to categories
                 }
-            ]
-            for cat in categories:
-                count = sum(1 for a in all_apps if a.get("display_category") == cat)
-                results.append(
-                    {
-                        "id": f"__cat__:{cat}",
-                        "name": cat,
-                        "description": f"{count} apps",
-                        "icon": CATEGORY_ICONS.get(cat, "folder"),
-                    }
-                )
-
-            print(
-                json.dumps(
-                    {
-                        "type": "results",
-                        "results": results,
-                        "inputMode": "realtime",
-                        "placeholder": "Search apps or select category...",
-                        "clearInput": True,
-                        "context": "",  # Clear context
-                        "navigateBack": True,  # Going back to categories
-                    }
-                )
             )
             return
 
         if selected_id == "__empty__":
             return
 
-        if selected_id.startswith("__action__:"):
-            # Format: __action__:<desktop_path>:<action_id>
-            parts = selected_id.split(":", 2)
-            if len(parts) == 3:
-                desktop_path = parts[1]
-                action_id = parts[2]
-
-                app = None
-                for a in all_apps:
-                    if a["id"] == desktop_path:
-                        app = a
-                        break
-
-                if app:
-                    action = None
-                    for act in app.get("actions", []):
-                        if act["id"] == action_id:
-                            action = act
-                            break
-
-                    if action:
-                        # Execute the action's command
-                        exec_parts = action["exec"].split()
-                        print(
-                            json.dumps(
-                                {
-                                    "type": "execute",
-                                    "execute": {
-                                        "command": exec_parts,
-                                        "name": f"{app['name']}: {action['name']}",
-                                        "icon": action.get("icon") or app["icon"],
-                                        "iconType": "system",
-                                        "close": True,
-                                    },
-                                }
-                            )
-                        )
-                        return
-
-            print(json.dumps({"type": "error", "message": "Action not found"}))
-            return
-
         if selected_id.startswith("__cat__:"):
             category = selected_id.replace("__cat__:", "")
             if category == "All":
                 apps = all_apps
             else:
-                apps = [a for a in all_apps if a.get("display_category") == category]
+                apps = [all_apps[i] for i in by_cat.get(category, [])]
 
             results = [
                 app_to_result(a, show_category=(category == "All")) for a in apps[:50]
             ]
 
-            print(
-                json.dumps(
-                    {
-                        "type": "results",
-                        "results": results,
-                        "inputMode": "realtime",
-                        "placeholder": f"Search in {category}..."
-                        if category != "All"
-                        else "Search all apps...",
-                        "clearInput": True,
-                        "context": selected_id,  # Set category context
-                        "navigateForward": True,  # Drilling into category
-                    }
-                )
+            emit(
+                {
+                    "type": "results",
+                    "results": results,
+                    "inputMode": "realtime",
+                    "placeholder": f"Search in {category}..."
+                    if category != "All"
+                    else "Search all apps...",
+                    "clearInput": True,
+                    "context": selected_id,  # Set category context
+                    "navigateForward": True,  # Drilling into category
+                }
             )
             return
 
-        app = None
-        for a in all_apps:
-            if a["id"] == selected_id:
-                app = a
-                break
+        # Unknown special id
+        launch_app(selected_id)
 
-        if app:
-            # Use gio launch with full path - more reliable than gtk-launch
-            # especially for Flatpak apps with .desktop.desktop naming
-            print(
-                json.dumps(
-                    {
-                        "type": "execute",
-                        "execute": {
-                            "command": ["gio", "launch", selected_id],
-                            "name": f"Launch {app['name']}",
-                            "icon": app["icon"],
-                            "iconType": "system",  # App icons are system icons
-                            "close": True,
-                        },
-                    }
-                )
-            )
-        else:
-            print(
-                json.dumps(
-                    {"type": "error", "message": f"App not found: {selected_id}"}
-                )
-            )
+
+def serve():
+    """Answer newline-delimited JSON requests until stdin closes.
+
+    Every request gets exactly one response line (empty if the step has
+    no output) so the launcher can match replies to requests.
+    """
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            handle(json.loads(line))
+        except Exception as e:
+            emit({"type": "error", "message": str(e)})
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+
+
+def main():
+    if "--daemon" in sys.argv[1:]:
+        serve()
+    else:
+        handle(json.load(sys.stdin))
 
 
 if __name__ == "__main__":
@@ -205,6 +205,84 @@ test_empty_action_is_safe() {
     assert_has_result "$search" "__empty__"
 }
 
+test_cached_app_list_matches_fresh_scan() {
+    local cache_dir=$(mktemp -d)
+    local fresh=$(XDG_CACHE_HOME="$cache_dir" hamr_test initial)
+    local cached=$(XDG_CACHE_HOME="$cache_dir" hamr_test initial)
+    rm -rf "$cache_dir"
+    
+    assert_eq "$(json_get "$cached" '.results[0].description')" "$(json_get "$fresh" '.results[0].description')"
+}
+
+test_cache_sees_desktop_file_edited_in_place() {
+    local home=$(mktemp -d)
+    local apps_dir="$home/.local/share/applications"
+    mkdir -p "$apps_dir"
+    printf '[Desktop Entry]\nType=Application\nName=Zqxold\nExec=true\n' > "$apps_dir/zqx.desktop"
+    HOME="$home" XDG_CACHE_HOME="$home/cache" hamr_test search --query "zqxold" > /dev/null
+    
+    # Rewrite the file but keep the directory mtime, as an in-place edit does
+    touch -r "$apps_dir" "$home/dir-mtime"
+    printf '[Desktop Entry]\nType=Application\nName=Zqxnew\nExec=true\n' > "$apps_dir/zqx.desktop"
+    touch -r "$home/dir-mtime" "$apps_dir"
+    local result=$(HOME="$home" XDG_CACHE_HOME="$home/cache" hamr_test search --query "zqxnew")
+    rm -rf "$home"
+    
+    assert_has_result "$result" "$apps_dir/zqx.desktop"
+}
+
+test_launch_rejects_desktop_file_outside_catalog() {
+    local dir=$(mktemp -d)
+    printf '[Desktop Entry]\nType=Application\nName=Rogue\nExec=true\nActions=run;\n\n[Desktop Action run]\nName=Run\nExec=true\n' > "$dir/rogue.desktop"
+    local app=$(hamr_test action --id "$dir/rogue.desktop")
+    local action=$(hamr_test action --id "__action__:$dir/rogue.desktop:run")
+    rm -rf "$dir"
+    
+    assert_type "$app" "error" && assert_type "$action" "error"
+}
+
+test_launch_rejects_path_escaping_app_dir() {
+    local home=$(mktemp -d)
+    mkdir -p "$home/.local/share/applications"
+    printf '[Desktop Entry]\nType=Application\nName=Rogue\nExec=true\n' > "$home/rogue.desktop"
+    local result=$(HOME="$home" hamr_test action --id "$home/.local/share/applications/../../../rogue.desktop")
+    rm -rf "$home"
+    
+    assert_type "$result" "error"
+}
+
+test_launch_skips_catalog_scan() {
+    local home=$(mktemp -d)
+    local apps_dir="$home/.local/share/applications"
+    mkdir -p "$apps_dir"
+    printf '[Desktop Entry]\nType=Application\nName=Zqx\nExec=true\nActions=run;\n\n[Desktop Action run]\nName=Run\nExec=true\n' > "$apps_dir/zqx.desktop"
+    local app=$(HOME="$home" XDG_CACHE_HOME="$home/cache" hamr_test action --id "$apps_dir/zqx.desktop")
+    local action=$(HOME="$home" XDG_CACHE_HOME="$home/cache" hamr_test action --id "__action__:$apps_dir/zqx.desktop:run")
+    local cached=$(ls "$home/cache/hamr" 2>/dev/null)
+    rm -rf "$home"
+    
+    assert_type "$app" "execute" && assert_type "$action" "execute" && assert_eq "$cached" ""
+}
+
+test_unknown_action_id_returns_error() {
+    local result=$(hamr_test action --id "__bogus__")
+    
+    assert_type "$result" "error"
+}
+
+test_daemon_answers_one_line_per_request() {
+    local output=$(printf '%s\n' \
+        '{"step": "initial"}' \
+        '{"step": "action", "selected": {"id": "__empty__"}}' \
+        '{"step": "search", "query": "zzzznonexistent"}' \
+        | HAMR_TEST_MODE=1 "$HANDLER" --daemon)
+    
+    assert_eq "$(echo "$output" | wc -l)" "3"
+    assert_type "$(echo "$output" | sed -n 1p)" "results"
+    assert_eq "$(echo "$output" | sed -n 2p)" ""
+    assert_has_result "$(echo "$output" | sed -n 3p)" "__empty__"
+}
+
 # ============================================================================
 # Run
 # ============================================================================
@@ -229,4 +307,11 @@ run_tests \
     test_back_clears_context \
     test_search_with_valid_json \
     test_category_has_icon \
-    test_empty_action_is_safe
+    test_empty_action_is_safe \
+    test_cached_app_list_matches_fresh_scan \
+    test_cache_sees_desktop_file_edited_in_place \
+    test_launch_rejects_desktop_file_outside_catalog \
+    test_launch_rejects_path_escaping_app_dir \
+    test_launch_skips_catalog_scan \
+    test_unknown_action_id_returns_error \
+    test_daemon_answers_one_line_per_request
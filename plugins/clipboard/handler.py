@@ -4,12 +4,11 @@ Clipboard workflow handler - browse and manage clipboard history via cliphist.
 Features: list, search, copy, delete, wipe, image thumbnails, OCR search
 """
 
-import hashlib
 import json
 import os
-import re
 import subprocess
 import sys
+from collections import namedtuple
 from pathlib import Path
 
 # Cache directory for image thumbnails and OCR
@@ -22,6 +21,8 @@ OCR_CACHE_FILE = CACHE_DIR / "ocr-index.json"
 SCRIPT_DIR = Path(__file__).parent
 # Max thumbnail size (width or height)
 MAX_THUMB_SIZE = 256
+# Results past this many show the truncated list line as text preview
+PREVIEW_DECODE_LIMIT = 20
 
 
 def get_clipboard_entries() -> list[str]:
@@ -43,7 +44,8 @@ def get_clipboard_entries() -> list[str]:
 def clean_entry(entry: str) -> str:
     """Clean cliphist entry for display (remove ID prefix)"""
     # Entry format: "ID\tCONTENT"
-    return re.sub(r"^\s*\S+\s+", "", entry)
+    _, sep, content = entry.partition("\t")
+    return content.lstrip() if sep else entry
 
 
 def get_full_entry_content(entry: str) -> str:
@@ -53,8 +55,8 @@ def get_full_entry_content(entry: str) -> str:
     """
     try:
         proc = subprocess.run(
-            f"printf '%s' '{shell_escape(entry)}' | cliphist decode",
-            shell=True,
+            ["cliphist", "decode"],
+            input=entry,
             capture_output=True,
             text=True,
             timeout=2,
@@ -69,26 +71,56 @@ def get_full_entry_content(entry: str) -> str:
 
 def get_entry_id(entry: str) -> str:
     """Extract the cliphist ID from entry"""
-    match = re.match(r"^\s*(\S+)\s+", entry)
-    return match.group(1) if match else ""
+    entry_id, sep, _ = entry.partition("\t")
+    return entry_id.strip() if sep else ""
 
 
 def is_image(entry: str) -> bool:
-    """Check if entry is an image"""
-    return bool(re.match(r"^\d+\t\[\[.*binary data.*\d+x\d+.*\]\]$", entry))
+    """Check if entry is an image ("ID\t[[ binary data ... WxH ]]")"""
+    entry_id, sep, content = entry.partition("\t")
+    return bool(
+        sep
+        and entry_id.isdigit()
+        and content.startswith("[[")
+        and content.endswith("]]")
+        and "binary data" in content
+        and get_image_dimensions(entry)
+    )
 
 
 def get_image_dimensions(entry: str) -> tuple[int, int] | None:
     """Extract image dimensions from entry"""
-    match = re.search(r"(\d+)x(\d+)", entry)
-    if match:
-        return int(match.group(1)), int(match.group(2))
+    content = entry.partition("\t")[2].removeprefix("[[").removesuffix("]]")
+    for token in content.split():
+        width, sep, height = token.partition("x")
+        if sep and width.isdigit() and height.isdigit():
+            return int(width), int(height)
     return None
 
 
+# A cliphist list line parsed once for display, filtering and search.
+# namedtuple rather than a dataclass: collections is already loaded at startup.
+Entry = namedtuple("Entry", "raw display display_lower is_image dims")
+
+
+def parse_entry(entry: str) -> Entry:
+    """Parse a raw cliphist entry into an Entry"""
+    display = clean_entry(entry)
+    is_img = is_image(entry)
+    return Entry(
+        raw=entry,
+        display=display,
+        display_lower=display.lower(),
+        is_image=is_img,
+        dims=get_image_dimensions(entry) if is_img else None,
+    )
+
+
 def get_entry_hash(entry: str) -> str:
     """Get a stable hash for a clipboard entry"""
-    return hashlib.md5(entry.encode()).hexdigest()[:16]
+    import hashlib
+
+    return hashlib.blake2b(entry.encode(), digest_size=8).hexdigest()
 
 
 def load_ocr_cache() -> dict[str, str]:
@@ -139,11 +171,9 @@ def get_image_thumbnail(entry: str) -> str | None:
     """Get cached thumbnail for image entry, return path or None.
 
     Does NOT generate thumbnails - that's done by the background indexer.
+    Callers are expected to pass image entries only.
     """
-    if not is_image(entry):
-        return None
-
-    entry_hash = hashlib.md5(entry.encode()).hexdigest()[:16]
+    entry_hash = get_entry_hash(entry)
     thumb_path = CACHE_DIR / f"{entry_hash}.png"
 
     # Only return if cached - don't block on generation
@@ -155,26 +185,43 @@ def get_image_thumbnail(entry: str) -> str | None:
 
 def copy_entry(entry: str):
     """Copy entry to clipboard"""
-    # Pipe entry to cliphist decode, then to wl-copy
-    subprocess.Popen(
-        f"printf '%s' '{shell_escape(entry)}' | cliphist decode | wl-copy",
-        shell=True,
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
-    )
+    # Pipe entry to cliphist decode, then to wl-copy (no shell in between)
+    try:
+        decoder = subprocess.Popen(
+            ["cliphist", "decode"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        subprocess.Popen(
+            ["wl-copy"],
+            stdin=decoder.stdout,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        decoder.stdout.close()
+        decoder.stdin.write(entry.encode())
+        decoder.stdin.close()
+    except OSError:
+        pass
 
 
 def delete_entry(entry: str):
     """Delete entry from clipboard history"""
-    subprocess.Popen(
-        f"printf '%s' '{shell_escape(entry)}' | cliphist delete",
-        shell=True,
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
-    )
+    try:
+        proc = subprocess.Popen(
+            ["cliphist", "delete"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        proc.stdin.write(entry.encode())
+        proc.stdin.close()
+    except OSError:
+        pass
 
     # Also remove thumbnail if exists
-    entry_hash = hashlib.md5(entry.encode()).hexdigest()[:16]
+    entry_hash = get_entry_hash(entry)
     thumb_path = CACHE_DIR / f"{entry_hash}.png"
     if thumb_path.exists():
         thumb_path.unlink()
@@ -199,9 +246,7 @@ def shell_escape(s: str) -> str:
 
 
 def fuzzy_match(query: str, text: str) -> bool:
-    """Simple fuzzy match - all query chars appear in order"""
-    query = query.lower()
-    text = text.lower()
+    """Simple fuzzy match on lowercased strings - all query chars appear in order"""
     qi = 0
     for char in text:
         if qi < len(query) and char == query[qi]:
@@ -219,13 +264,15 @@ def get_entry_results(
     """Convert clipboard entries to result format"""
     results = []
     ocr_texts = ocr_texts or {}
+    query_lower = query.lower()
 
     for entry in entries:
         # Stop once we have enough results
         if len(results) >= limit:
             break
+        parsed = parse_entry(entry)
         # Apply type filter
-        is_img = is_image(entry)
+        is_img = parsed.is_image
         if filter_type == "images" and not is_img:
             continue
         if filter_type == "text" and is_img:
@@ -233,17 +280,19 @@ def get_entry_results(
 
         # Apply search query (check both content and OCR text for images)
         if query:
-            content_match = fuzzy_match(query, clean_entry(entry))
+            content_match = fuzzy_match(query_lower, parsed.display_lower)
             ocr_text = ocr_texts.get(entry, "")
-            ocr_match = is_img and ocr_text and fuzzy_match(query, ocr_text)
+            ocr_match = (
+                is_img and ocr_text and fuzzy_match(query_lower, ocr_text.lower())
+            )
             if not content_match and not ocr_match:
                 continue
 
-        display = clean_entry(entry)
+        display = parsed.display
+        dims = parsed.dims
 
         # For images, show dimensions and OCR preview if available
         if is_img:
-            dims = get_image_dimensions(entry)
             display = f"Image {dims[0]}x{dims[1]}" if dims else "Image"
             ocr_text = ocr_texts.get(entry, "")
             if ocr_text:
@@ -282,10 +331,9 @@ def get_entry_results(
         # Add preview panel data
         if is_img and thumbnail:
             preview_metadata = []
-            img_dims = get_image_dimensions(entry)
-            if img_dims:
+            if dims:
                 preview_metadata.append(
-                    {"label": "Size", "value": f"{img_dims[0]}x{img_dims[1]}"}
+                    {"label": "Size", "value": f"{dims[0]}x{dims[1]}"}
                 )
             ocr_text = ocr_texts.get(entry, "")
             if ocr_text:
@@ -308,7 +356,11 @@ def get_entry_results(
             }
         elif not is_img:
             # Text preview - show full content (use cliphist decode for untruncated content)
-            full_content = get_full_entry_content(entry)
+            # Decoding spawns cliphist, so only the top results get full text
+            if len(results) < PREVIEW_DECODE_LIMIT:
+                full_content = get_full_entry_content(entry)
+            else:
+                full_content = clean_entry(entry)
             char_count = len(full_content)
             line_count = full_content.count("\n") + 1
 
@@ -367,6 +419,11 @@ def get_plugin_actions(active_filter: str = "") -> list[dict]:
     ]
 
 
+def emit(response: dict):
+    """Write a JSON response to stdout as a single compact write"""
+    sys.stdout.write(json.dumps(response, separators=(",", ":"), ensure_ascii=False))
+
+
 def respond(results: list[dict], **kwargs):
     """Send a results response"""
     active_filter = kwargs.get("active_filter", "")
@@ -383,7 +440,7 @@ def respond(results: list[dict], **kwargs):
         response["clearInput"] = True
     if kwargs.get("navigate_forward") is False:
         response["navigateForward"] = False
-    print(json.dumps(response))
+    emit(response)
 
 
 def entry_to_index_item(entry: str, ocr_texts: dict[str, str]) -> dict:
@@ -483,20 +540,18 @@ def main():
             # Find removed items (in indexed but not current)
             removed_ids = list(indexed_ids - current_ids)
 
-            print(
-                json.dumps(
-                    {
-                        "type": "index",
-                        "mode": "incremental",
-                        "items": new_items,
-                        "remove": removed_ids,
-                    }
-                )
+            emit(
+                {
+                    "type": "index",
+                    "mode": "incremental",
+                    "items": new_items,
+                    "remove": removed_ids,
+                }
             )
         else:
             # Full reindex
             items = [entry_to_index_item(e, ocr_texts) for e in current_entries]
-            print(json.dumps({"type": "index", "items": items}))
+            emit({"type": "index", "items": items})
         return
 
     if step == "initial":
@@ -540,22 +595,20 @@ def main():
             # Wipe all
             if action == "wipe":
                 wipe_clipboard()
-                print(
-                    json.dumps(
-                        {
-                            "type": "execute",
-                            "execute": {
-                                "command": [
-                                    "notify-send",
-                                    "Clipboard",
-                                    "History cleared",
-                                    "-a",
-                                    "Shell",
-                                ],
-                                "close": True,
-                            },
-                        }
-                    )
+                emit(
+                    {
+                        "type": "execute",
+                        "execute": {
+                            "command": [
+                                "notify-send",
+                                "Clipboard",
+                                "History cleared",
+                                "-a",
+                                "Shell",
+                            ],
+                            "close": True,
+                        },
+                    }
                 )
                 return
 
@@ -596,21 +649,19 @@ def main():
         # Default action (click) or explicit copy
         if action == "copy" or not action:
             copy_entry(entry)
-            print(
-                json.dumps(
-                    {
-                        "type": "execute",
-                        "execute": {
-                            "command": ["true"],  # No-op, just close
-                            "close": True,
-                        },
-                    }
-                )
+            emit(
+                {
+                    "type": "execute",
+                    "execute": {
+                        "command": ["true"],  # No-op, just close
+                        "close": True,
+                    },
+                }
             )
             return
 
     # Unknown
-    print(json.dumps({"type": "error", "message": f"Unknown step: {step}"}))
+    emit({"type": "error", "message": f"Unknown step: {step}"})
 
 
 if __name__ == "__main__":
@@ -20,6 +20,9 @@ CACHE_DIR = (
 )
 OCR_CACHE_FILE = CACHE_DIR / "ocr-index.json"
 LOCK_FILE = CACHE_DIR / "ocr-indexer.lock"
+# Version 2 keys thumbnails and OCR text by BLAKE2b instead of md5
+CACHE_VERSION = 2
+CACHE_VERSION_FILE = CACHE_DIR / "cache-version"
 
 # Optimization settings
 MAX_IMAGES_TO_OCR = 20  # Only OCR the most recent N images (OCR is slow)
@@ -112,9 +115,58 @@ def is_image_worth_ocr(entry: str) -> bool:
 
 def get_entry_hash(entry: str) -> str:
     """Get a stable hash for a clipboard entry"""
+    return hashlib.blake2b(entry.encode(), digest_size=8).hexdigest()
+
+
+def get_legacy_entry_hash(entry: str) -> str:
+    """Hash used for cache file names before CACHE_VERSION 2"""
     return hashlib.md5(entry.encode()).hexdigest()[:16]
 
 
+def migrate_cache(image_entries: list[str], ocr_cache: dict[str, str]) -> None:
+    """Bring the cache up to CACHE_VERSION, once.
+
+    Thumbnails and OCR text of entries still in history are renamed to
+    their new hash so nothing is re-OCR'd. Anything else left over belongs
+    to entries cliphist no longer has and is removed.
+    """
+    try:
+        if int(CACHE_VERSION_FILE.read_text()) >= CACHE_VERSION:
+            return
+    except (OSError, ValueError):
+        pass
+
+    current = set()
+    for entry in image_entries:
+        old_hash = get_legacy_entry_hash(entry)
+        new_hash = get_entry_hash(entry)
+        current.add(new_hash)
+        if old_hash in ocr_cache:
+            ocr_cache.setdefault(new_hash, ocr_cache[old_hash])
+        old_thumb = CACHE_DIR / f"{old_hash}.png"
+        new_thumb = CACHE_DIR / f"{new_hash}.png"
+        if old_thumb.exists() and not new_thumb.exists():
+            try:
+                old_thumb.rename(new_thumb)
+            except OSError:
+                pass
+
+    for thumb in CACHE_DIR.glob("*.png"):
+        if thumb.stem not in current:
+            try:
+                thumb.unlink(missing_ok=True)
+            except OSError:
+                pass
+    for key in [k for k in ocr_cache if k not in current]:
+        del ocr_cache[key]
+
+    save_ocr_cache(ocr_cache)
+    try:
+        CACHE_VERSION_FILE.write_text(str(CACHE_VERSION))
+    except OSError:
+        pass
+
+
 def get_tesseract_languages() -> str:
     """Get available tesseract languages as a + separated string."""
     try:
@@ -150,7 +202,53 @@ def decode_image(entry: str) -> bytes | None:
     return None
 
 
-def generate_thumbnail(entry: str, image_data: bytes) -> bool:
+def resize_to_thumbnail(entry: str, thumb_path: Path) -> bool:
+    """Pipe cliphist decode straight into ImageMagick, return True on success"""
+    try:
+        decoder = subprocess.Popen(
+            ["cliphist", "decode"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+    except OSError:
+        return False
+
+    try:
+        magick = subprocess.Popen(
+            [
+                "magick",
+                "-",
+                "-thumbnail",
+                f"{MAX_THUMB_SIZE}x{MAX_THUMB_SIZE}>",
+                str(thumb_path),
+            ],
+            stdin=decoder.stdout,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    except OSError:
+        decoder.kill()
+        decoder.wait()
+        return False
+    decoder.stdout.close()
+
+    try:
+        decoder.stdin.write(entry.encode("utf-8"))
+        decoder.stdin.close()
+        magick.wait(timeout=10)
+    except (subprocess.TimeoutExpired, OSError):
+        magick.kill()
+        magick.wait()
+        return False
+    finally:
+        decoder.kill()
+        decoder.wait()
+
+    return magick.returncode == 0 and thumb_path.exists()
+
+
+def generate_thumbnail(entry: str) -> bool:
     """Generate thumbnail for an image entry, return True if successful"""
     entry_hash = get_entry_hash(entry)
     thumb_path = CACHE_DIR / f"{entry_hash}.png"
@@ -158,32 +256,21 @@ def generate_thumbnail(entry: str, image_data: bytes) -> bool:
     if thumb_path.exists():
         return True
 
+    # Large images never pass through Python: decode output feeds magick
+    dims = get_image_dimensions(entry)
+    if dims and (dims[0] > MAX_THUMB_SIZE or dims[1] > MAX_THUMB_SIZE):
+        if resize_to_thumbnail(entry, thumb_path):
+            return True
+
+    # Save as-is if small or resize failed
+    image_data = decode_image(entry)
+    if not image_data:
+        return False
     try:
-        dims = get_image_dimensions(entry)
-        if dims and (dims[0] > MAX_THUMB_SIZE or dims[1] > MAX_THUMB_SIZE):
-            # Resize with ImageMagick
-            resize_proc = subprocess.run(
-                [
-                    "magick",
-                    "-",
-                    "-thumbnail",
-                    f"{MAX_THUMB_SIZE}x{MAX_THUMB_SIZE}>",
-                    str(thumb_path),
-                ],
-                input=image_data,
-                capture_output=True,
-                timeout=10,
-            )
-            if resize_proc.returncode == 0 and thumb_path.exists():
-                return True
-
-        # Save as-is if small or resize failed
         thumb_path.write_bytes(image_data)
         return True
-
-    except (subprocess.TimeoutExpired, Exception):
-        pass
-    return False
+    except OSError:
+        return False
 
 
 def run_ocr_on_image(image_data: bytes, lang_str: str) -> str:
@@ -229,6 +316,8 @@ def main():
 
         # Get all image entries (most recent first from cliphist)
         image_entries = [e for e in entries if is_image(e)]
+        if entries:
+            migrate_cache(image_entries, ocr_cache)
 
         top_ocr_candidates = []
         for entry in image_entries:
@@ -264,9 +353,7 @@ def main():
 
         # Process thumbnails first (fast)
         for entry in thumbs_needed:
-            image_data = decode_image(entry)
-            if image_data:
-                generate_thumbnail(entry, image_data)
+            generate_thumbnail(entry)
 
         # Process OCR (slow, only for top N recent images)
         ocr_count = 0
@@ -473,6 +473,13 @@ test_tab_separated_entry() {
     assert_contains "$result" "Text"
 }
 
+test_leading_whitespace_is_trimmed() {
+    set_clipboard_entries "1	   indented text"
+    local result=$(hamr_test initial)
+    
+    assert_json "$result" '.results[0].name' "indented text"
+}
+
 test_unicode_in_entry() {
     set_clipboard_entries "1	Hello 世界 🌍 мир"
     local result=$(hamr_test initial)
@@ -598,6 +605,7 @@ run_tests \
     test_multiline_entries \
     test_empty_entry \
     test_tab_separated_entry \
+    test_leading_whitespace_is_trimmed \
     test_unicode_in_entry \
     test_search_unicode \
     test_initial_uses_realtime_mode \
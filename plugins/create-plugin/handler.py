@@ -4,6 +4,7 @@ Create Plugin - AI helper to create new workflow plugins for Hamr launcher
 
 IMPORTANT: This plugin requires OpenCode CLI to be installed.
 Install opencode: https://opencode.ai
+python-orjson is used for faster JSON handling when installed (optional).
 
 This plugin provides a conversational interface where the AI will:
 1. Ask clarifying questions about your plugin idea
@@ -16,52 +17,344 @@ with instructions for manual plugin creation.
 
 import json
 import os
-import shutil
-import subprocess
 import sys
 import time
+from collections.abc import Iterable
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
+# Optional orjson for faster session/event (de)serialization
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Test mode - mock external dependencies
 TEST_MODE = os.environ.get("HAMR_TEST_MODE") == "1"
 
-OPENCODE_AVAILABLE = shutil.which("opencode") is not None or TEST_MODE
+# Shared `opencode serve` process (runtime dir: gone after logout)
+SERVER_STATE_FILE = (
+    Path(os.environ.get("XDG_RUNTIME_DIR", f"/run/user/{os.getuid()}"))
+    / "hamr"
+    / "create-plugin-server.json"
+)
+SERVER_START_TIMEOUT = 10  # seconds
+# The server is stopped after this long without a message
+SERVER_IDLE_TIMEOUT = 15 * 60  # seconds
+SERVER_IDLE_CHECK = 60  # seconds between watchdog checks
+OPENCODE_TIMEOUT = 120  # seconds per message
+OPENCODE_RUN_ARGS = ("run", "--format", "json")
+
+# Session storage: append-only transcript plus small metadata file
+SESSION_DIR = Path.home() / ".cache" / "hamr" / "create-plugin"
+MESSAGES_FILE = SESSION_DIR / "messages.jsonl"
+STATE_FILE = SESSION_DIR / "state.json"
+# Raw opencode events per reply, kept out of the transcript and the card
+EVENTS_DIR = SESSION_DIR / "events"
+STATE_TMP_FILE = SESSION_DIR / "state.json.tmp"
+# Only the newest messages go into the card; the transcript keeps them all
+MAX_CARD_MESSAGES = 40
+LEGACY_SESSION_FILE = Path.home() / ".cache" / "hamr" / "create-plugin-session.json"
+
+# Resolved opencode binary, stored with the $PATH it was found on
+OPENCODE_PATH_CACHE = Path.home() / ".cache" / "hamr" / "opencode-path"
+
+
+def json_loads(data: str | bytes):
+    """Parse JSON with orjson when available"""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj) -> bytes:
+    """Serialize to compact UTF-8 JSON with orjson when available"""
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+@lru_cache(maxsize=1)
+def find_opencode() -> str | None:
+    """Locate the opencode binary, remembering the answer for this $PATH.
+
+    A cache hit costs one read and one access() check instead of probing
+    every PATH entry. Misses are not cached so a fresh install is found.
+    """
+    path_env = os.environ.get("PATH", "")
+    try:
+        cached_path_env, cached = OPENCODE_PATH_CACHE.read_text().split("\n")[:2]
+        if cached_path_env == path_env and os.access(cached, os.X_OK):
+            return cached
+    except (OSError, ValueError):
+        pass
+
+    import shutil
+
+    found = shutil.which("opencode")
+    if found:
+        try:
+            OPENCODE_PATH_CACHE.parent.mkdir(parents=True, exist_ok=True)
+            OPENCODE_PATH_CACHE.write_text(f"{path_env}\n{found}\n")
+        except OSError:
+            pass
+    return found
+
 
-# Session storage file
-SESSION_FILE = Path.home() / ".cache" / "hamr" / "create-plugin-session.json"
+def opencode_available() -> bool:
+    """Check whether the opencode CLI is installed"""
+    return TEST_MODE or find_opencode() is not None
 
 
+@lru_cache(maxsize=1)
 def get_plugins_dir() -> Path:
     """Get the plugins directory path"""
     config_home = os.environ.get("XDG_CONFIG_HOME", os.path.expanduser("~/.config"))
     return Path(config_home) / "hamr" / "plugins"
 
 
+def iter_messages():
+    """Stream conversation messages from the transcript, one per line"""
+    try:
+        with open(MESSAGES_FILE, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield json_loads(line)
+                except json.JSONDecodeError:
+                    # Skip a torn trailing line from an interrupted append
+                    continue
+    except OSError:
+        return
+
+
 def load_session() -> dict:
     """Load conversation session from cache"""
-    if SESSION_FILE.exists():
+    migrate_legacy_session()
+    session = {"state": "initial"}
+    try:
+        with open(STATE_FILE, "rb") as f:
+            session.update(json_loads(f.read()))
+    except (json.JSONDecodeError, IOError):
+        pass
+    session["messages"] = list(iter_messages())
+    return session
+
+
+def has_messages() -> bool:
+    """Check for an existing conversation without reading the whole transcript"""
+    migrate_legacy_session()
+    return next(iter_messages(), None) is not None
+
+
+def open_session_file(path: Path, mode: str):
+    """Open a session file, creating its dir only on first use"""
+    try:
+        return open(path, mode)
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return open(path, mode)
+
+
+def append_messages(new_messages: list[dict]):
+    """Append messages to the transcript without rewriting earlier turns"""
+    data = b"".join(json_dumps(m) + b"\n" for m in new_messages)
+    with open_session_file(MESSAGES_FILE, "ab") as f:
+        f.write(data)
+
+
+def save_events(events: list[dict]) -> str:
+    """Store a reply's raw opencode events, return the reference id"""
+    ref = f"{time.time_ns():x}"
+    path = EVENTS_DIR / f"{ref}.jsonl"
+    with open_session_file(path, "wb") as f:
+        f.write(b"".join(json_dumps(e) + b"\n" for e in events))
+    return ref
+
+
+def clear_events():
+    """Delete every stored event file"""
+    try:
+        entries = list(os.scandir(EVENTS_DIR))
+    except OSError:
+        return
+    for entry in entries:
         try:
-            with open(SESSION_FILE) as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
+            os.unlink(entry.path)
+        except OSError:
             pass
-    return {"messages": [], "state": "initial"}
 
 
-def save_session(session: dict):
-    """Save conversation session to cache"""
-    SESSION_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(SESSION_FILE, "w") as f:
-        json.dump(session, f)
+def save_state(session: dict):
+    """Save non-message session fields (compact, atomic replace)"""
+    state = {k: v for k, v in session.items() if k != "messages"}
+    with open_session_file(STATE_TMP_FILE, "wb") as f:
+        f.write(json_dumps(state))
+    os.replace(STATE_TMP_FILE, STATE_FILE)
+
+
+def migrate_legacy_session():
+    """Convert the old single-file session into the transcript layout"""
+    if not LEGACY_SESSION_FILE.exists():
+        return
+    try:
+        with open(LEGACY_SESSION_FILE, encoding="utf-8") as f:
+            legacy = json.load(f)
+        if not MESSAGES_FILE.exists():
+            append_messages(legacy.get("messages", []))
+            save_state(legacy)
+    except (json.JSONDecodeError, IOError, AttributeError):
+        pass
+    LEGACY_SESSION_FILE.unlink(missing_ok=True)
 
 
 def clear_session():
     """Clear the conversation session"""
-    if SESSION_FILE.exists():
-        SESSION_FILE.unlink()
+    MESSAGES_FILE.unlink(missing_ok=True)
+    STATE_FILE.unlink(missing_ok=True)
+    clear_events()
+
+
+def port_is_open(port: int) -> bool:
+    """Check whether something accepts connections on localhost:port"""
+    import socket
+
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+            return True
+    except OSError:
+        return False
+
+
+def is_opencode_server(pid: int, port: int) -> bool:
+    """Check that pid is still the `opencode serve` we started on port"""
+    try:
+        cmdline = Path(f"/proc/{pid}/cmdline").read_bytes()
+    except OSError:
+        return False
+    args = os.fsdecode(cmdline).split("\0")
+    return (
+        any("opencode" in os.path.basename(arg) for arg in args)
+        and "serve" in args
+        and str(port) in args
+    )
+
+
+def get_opencode_server() -> str | None:
+    """Return the URL of a shared `opencode serve`, starting it if needed.
+
+    `opencode run --attach` reuses the running server instead of booting
+    opencode (and its MCP servers) for every message. The state file is
+    touched on every use; a watchdog stops the server once it has been
+    idle for SERVER_IDLE_TIMEOUT.
+    """
+    import subprocess
+
+    plugins_dir = str(get_plugins_dir())
+    try:
+        state = json.loads(SERVER_STATE_FILE.read_text())
+        if (
+            state["cwd"] == plugins_dir
+            and is_opencode_server(state["pid"], state["port"])
+            and port_is_open(state["port"])
+        ):
+            os.utime(SERVER_STATE_FILE)
+            return f"http://127.0.0.1:{state['port']}"
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    import socket
+
+    # Let the kernel pick a free port
+    try:
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+    except OSError:
+        return None
+
+    try:
+        Path(plugins_dir).mkdir(parents=True, exist_ok=True)
+        proc = subprocess.Popen(
+            [
+                find_opencode() or "opencode",
+                "serve",
+                "--hostname",
+                "127.0.0.1",
+                "--port",
+                str(port),
+            ],
+            cwd=plugins_dir,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError:
+        return None
+
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while not port_is_open(port):
+        if proc.poll() is not None:
+            return None
+        if time.monotonic() >= deadline:
+            proc.kill()
+            return None
+        time.sleep(0.1)
+
+    # Only advertise the server once it accepts connections. Without a state
+    # file or a watchdog nothing would ever stop it, so run standalone instead
+    try:
+        SERVER_STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = SERVER_STATE_FILE.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"pid": proc.pid, "port": port, "cwd": plugins_dir}))
+        os.replace(tmp, SERVER_STATE_FILE)
+    except OSError:
+        proc.terminate()
+        return None
+
+    try:
+        subprocess.Popen(
+            [sys.executable, __file__, "--watch-server", str(proc.pid), str(port)],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError:
+        proc.terminate()
+        try:
+            SERVER_STATE_FILE.unlink(missing_ok=True)
+        except OSError:
+            pass
+        return None
+    return f"http://127.0.0.1:{port}"
+
+
+def watch_opencode_server(pid: int, port: int):
+    """Stop the shared server once it is idle or no longer the current one"""
+    import signal
+
+    while True:
+        time.sleep(SERVER_IDLE_CHECK)
+        if not is_opencode_server(pid, port):
+            return
+        try:
+            current = json.loads(SERVER_STATE_FILE.read_text()).get("pid") == pid
+            idle = time.time() - SERVER_STATE_FILE.stat().st_mtime
+        except (OSError, ValueError, AttributeError):
+            current, idle = False, 0
+        if current and idle < SERVER_IDLE_TIMEOUT:
+            continue
+        if current:
+            SERVER_STATE_FILE.unlink(missing_ok=True)
+        os.kill(pid, signal.SIGTERM)
+        return
 
 
+@lru_cache(maxsize=1)
 def get_system_prompt() -> str:
     """Get the system prompt for the AI"""
     plugins_dir = get_plugins_dir()
@@ -135,70 +428,109 @@ When converting, focus on the CORE FUNCTIONALITY. Don't try to replicate every f
 prioritize what works well on Linux. Safari support doesn't make sense on Linux, for example."""
 
 
+def system_prompt_sent(session: dict) -> bool:
+    """Whether opencode already has a conversation started with our prompt"""
+    if session.get("system_prompt_sent"):
+        return True
+    # Sessions saved before the flag existed: any reply means it was sent
+    return any(m.get("role") == "assistant" for m in session.get("messages", []))
+
+
+def mark_system_prompt_sent(session: dict):
+    """Persist that later messages should continue the conversation"""
+    if not session.get("system_prompt_sent"):
+        session["system_prompt_sent"] = True
+        save_state(session)
+
+
 def chat_with_opencode(user_message: str, session: dict) -> tuple[bool, dict]:
     """Send a message to OpenCode and return a structured payload."""
 
     # Mock response in test mode
     if TEST_MODE:
-        messages = session.get("messages", [])
         now = int(time.time())
         mock_response = f"Mock AI response to: {user_message}"
-        messages.append({"role": "user", "content": user_message, "ts": now})
-        messages.append(
+        new_messages = [
+            {"role": "user", "content": user_message, "ts": now},
             {
                 "role": "assistant",
                 "content": mock_response,
                 "ts": now,
                 "thinking": "",
-                "toolCalls": "",
-                "raw": "",
-            }
-        )
-        session["messages"] = messages
-        save_session(session)
+            },
+        ]
+        session.setdefault("messages", []).extend(new_messages)
+        append_messages(new_messages)
+        mark_system_prompt_sent(session)
         return True, {"text": mock_response}
 
+    # Only the chat path spawns processes, so keep subprocess off startup
+    import subprocess
+    import tempfile
+    import threading
+
     try:
         messages = session.get("messages", [])
 
-        # First message includes system prompt
-        if not messages:
-            full_prompt = f"{get_system_prompt()}\n\nUser: {user_message}"
-        else:
+        # First message includes system prompt; a failed first attempt
+        # (only a system error in the transcript) retries with it
+        continuing = system_prompt_sent(session)
+        if continuing:
             full_prompt = user_message
+        else:
+            full_prompt = f"{get_system_prompt()}\n\nUser: {user_message}"
 
-        cmd = ["opencode", "run", "--format", "json"]
-        if messages:
-            cmd.append("--continue")
-        cmd.append(full_prompt)
-
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=120,
-            cwd=str(get_plugins_dir()),
-        )
-
-        if result.returncode != 0:
-            return False, {"error": result.stderr or "OpenCode command failed"}
-
-        payload = extract_opencode_payload(result.stdout)
+        cmd = (find_opencode() or "opencode", *OPENCODE_RUN_ARGS)
+        # Fall back to a standalone run if the server can't be reached
+        server_url = get_opencode_server()
+        if server_url:
+            cmd += ("--attach", server_url)
+        cmd += ("--continue", full_prompt) if continuing else (full_prompt,)
+
+        # Parse events as opencode emits them instead of buffering stdout
+        with tempfile.TemporaryFile() as stderr_file:
+            proc = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=stderr_file,
+                text=True,
+                cwd=str(get_plugins_dir()),
+            )
+            # Kill a hung run; reading stdout then hits EOF and returns
+            started = time.monotonic()
+            timer = threading.Timer(OPENCODE_TIMEOUT, proc.kill)
+            timer.start()
+            try:
+                with proc.stdout:
+                    payload = extract_opencode_payload(proc.stdout)
+                proc.wait()
+            finally:
+                timer.cancel()
+
+            if time.monotonic() - started >= OPENCODE_TIMEOUT:
+                raise subprocess.TimeoutExpired(cmd, OPENCODE_TIMEOUT)
+            if proc.returncode != 0:
+                stderr_file.seek(0)
+                stderr = stderr_file.read().decode("utf-8", errors="replace")
+                return False, {"error": stderr or "OpenCode command failed"}
 
         now = int(time.time())
-        messages.append({"role": "user", "content": user_message, "ts": now})
-        messages.append(
-            {
-                "role": "assistant",
-                "content": payload.get("text", ""),
-                "ts": int(time.time()),
-                "thinking": payload.get("thinking", ""),
-                "toolCalls": payload.get("toolCalls", ""),
-                "raw": payload.get("raw", ""),
-            }
-        )
+        reply = {
+            "role": "assistant",
+            "content": payload.get("text", ""),
+            "ts": now,
+            "thinking": payload.get("thinking", ""),
+        }
+        if payload["events"]:
+            reply["rawRef"] = save_events(payload["events"])
+        new_messages = [
+            {"role": "user", "content": user_message, "ts": now},
+            reply,
+        ]
+        messages.extend(new_messages)
         session["messages"] = messages
-        save_session(session)
+        append_messages(new_messages)
+        mark_system_prompt_sent(session)
 
         return True, payload
 
@@ -208,28 +540,31 @@ def chat_with_opencode(user_message: str, session: dict) -> tuple[bool, dict]:
         return False, {"error": f"Error: {e}"}
 
 
-def _dedupe_consecutive(items: list[str]) -> list[str]:
-    out: list[str] = []
-    for item in items:
-        if item and (not out or out[-1] != item):
-            out.append(item)
-    return out
+def _append_part(parts: list[str], item: str):
+    """Append unless empty or a repeat of the previous part"""
+    if item and (not parts or parts[-1] != item):
+        parts.append(item)
 
 
-def extract_opencode_payload(stdout: str) -> dict:
-    """Extract readable text + raw events from OpenCode JSON stream."""
+def extract_opencode_payload(lines: Iterable[str]) -> dict:
+    """Extract readable text + raw events from OpenCode JSON stream lines."""
 
-    lines = stdout.strip().split("\n")
     text_parts: list[str] = []
     events: list[dict] = []
     thinking_parts: list[str] = []
 
     for line in lines:
-        if not line.strip():
+        stripped = line.strip()
+        if not stripped:
+            continue
+
+        # Plain text output never parses as an event, skip the JSON parser
+        if stripped[0] != "{":
+            _append_part(text_parts, line.rstrip("\n"))
             continue
 
         try:
-            event = json.loads(line)
+            event = json_loads(stripped)
             events.append(event)
 
             event_type = (event.get("type") or "").strip()
@@ -239,52 +574,33 @@ def extract_opencode_payload(stdout: str) -> dict:
                 if isinstance(part, dict):
                     text = part.get("text")
                     if isinstance(text, str) and text:
-                        text_parts.append(text)
+                        _append_part(text_parts, text)
 
                     for key in ("thinking", "thought", "reasoning"):
                         maybe = part.get(key)
                         if isinstance(maybe, str) and maybe:
-                            thinking_parts.append(maybe)
+                            _append_part(thinking_parts, maybe)
 
             elif event_type == "message.completed":
                 content = event.get("message", {}).get("content", "")
                 if isinstance(content, str) and content:
-                    text_parts.append(content)
+                    _append_part(text_parts, content)
 
         except json.JSONDecodeError:
-            # Not JSON, might be plain text output
-            if line.strip() and not line.startswith("{"):
-                text_parts.append(line)
-
-    text = "\n".join(_dedupe_consecutive(text_parts)).strip()
-    thinking = "\n".join(_dedupe_consecutive(thinking_parts)).strip()
-
-    # Heuristic: treat any event with "tool" in its type (or an explicit tool field)
-    # as a tool-call artifact.
-    tool_events = [
-        e
-        for e in events
-        if "tool" in (e.get("type", "").lower()) or e.get("tool") is not None
-    ]
-
-    def pretty(obj) -> str:
-        try:
-            return json.dumps(obj, indent=2, ensure_ascii=False)
-        except TypeError:
-            return str(obj)
+            continue
 
-    return {
-        "text": text,
-        "thinking": thinking,
-        "toolCalls": pretty(tool_events) if tool_events else "",
-        "raw": pretty(events) if events else "",
-    }
+    text = "\n".join(text_parts).strip()
+    thinking = "\n".join(thinking_parts).strip()
 
+    return {"text": text, "thinking": thinking, "events": events}
 
+
+@lru_cache(maxsize=128)
 def format_time(ts: int) -> str:
     return datetime.fromtimestamp(ts).strftime("%H:%M")
 
 
+@lru_cache(maxsize=128)
 def format_date(ts: int) -> str:
     return datetime.fromtimestamp(ts).strftime("%b %d, %Y")
 
@@ -293,6 +609,9 @@ def build_conversation_card(session: dict, *, title: str) -> dict:
     messages = session.get("messages", [])
 
     blocks: list[dict] = []
+    if len(messages) > MAX_CARD_MESSAGES:
+        blocks.append({"type": "separator", "text": "Earlier messages hidden"})
+        messages = messages[-MAX_CARD_MESSAGES:]
 
     last_date = ""
     for msg in messages:
@@ -310,29 +629,26 @@ def build_conversation_card(session: dict, *, title: str) -> dict:
                 blocks.append({"type": "pill", "text": current_date})
                 last_date = current_date
 
+        block = {
+            "type": "message",
+            "role": role,
+            "content": content,
+            "markdown": role != "user",
+            "timestamp": format_time(ts_int) if ts_int is not None else "",
+        }
         details = {
-            "thinking": msg.get("thinking", ""),
-            "toolCalls": msg.get("toolCalls", ""),
-            "artifacts": msg.get("artifacts", []),
-            "raw": msg.get("raw", ""),
+            key: value
+            for key, value in (
+                ("thinking", msg.get("thinking")),
+                ("toolCalls", msg.get("toolCalls")),
+                ("artifacts", msg.get("artifacts")),
+                ("raw", msg.get("raw")),
+            )
+            if value
         }
-
-        blocks.append(
-            {
-                "type": "message",
-                "role": role,
-                "content": content,
-                "markdown": role != "user",
-                "timestamp": format_time(ts_int) if ts_int is not None else "",
-                "details": details,
-            }
-        )
-
-    transcript = "\n\n".join(
-        f"{m.get('role', 'assistant')}: {m.get('content', '').strip()}".strip()
-        for m in messages
-        if (m.get("content") or "").strip()
-    ).strip()
+        if details:
+            block["details"] = details
+        blocks.append(block)
 
     return {
         "kind": "blocks",
@@ -341,25 +657,16 @@ def build_conversation_card(session: dict, *, title: str) -> dict:
         "maxHeight": 820,
         "showDetails": False,
         "allowToggleDetails": True,
-        "transcript": transcript,
     }
 
 
-def main():
-    input_data = json.load(sys.stdin)
-    step = input_data.get("step", "initial")
-    query = input_data.get("query", "").strip()
-    selected = input_data.get("selected", {})
-
-    # Check opencode availability
-    if not OPENCODE_AVAILABLE:
-        print(
-            json.dumps(
-                {
-                    "type": "card",
-                    "card": {
-                        "title": "OpenCode Required",
-                        "content": """**OpenCode CLI is required to use this plugin.**
+# Responses that never change, serialized once per process
+STATIC_RESPONSES = {
+    "opencode_required": {
+        "type": "card",
+        "card": {
+            "title": "OpenCode Required",
+            "content": """**OpenCode CLI is required to use this plugin.**
 
 OpenCode is an AI coding agent for the terminal.
 
@@ -375,65 +682,152 @@ You can manually create plugins by:
 3. Adding a `handler.py` script that reads JSON from stdin and outputs JSON to stdout
 
 See existing plugins for examples.""",
-                        "markdown": True,
-                    },
-                }
-            )
-        )
+            "markdown": True,
+        },
+    },
+    "initial_with_history": {
+        "type": "results",
+        "inputMode": "submit",
+        "results": [
+            {
+                "id": "continue",
+                "name": "Continue previous conversation",
+                "description": "Resume where you left off",
+                "icon": "history",
+            },
+            {
+                "id": "new",
+                "name": "Start new conversation",
+                "description": "Clear history and start fresh",
+                "icon": "add_circle",
+            },
+            {
+                "id": "help",
+                "name": "How plugins work",
+                "description": "Learn about the plugin protocol",
+                "icon": "help",
+            },
+        ],
+        "placeholder": "Type your message and press Enter...",
+    },
+    "initial_new": {
+        "type": "results",
+        "inputMode": "submit",
+        "results": [
+            {
+                "id": "help",
+                "name": "How plugins work",
+                "description": "Learn about the plugin protocol",
+                "icon": "help",
+            },
+        ],
+        "placeholder": "Describe the plugin you want to create... (Enter to send)",
+    },
+    "empty_search": {
+        "type": "results",
+        "inputMode": "submit",
+        "results": [],
+        "placeholder": "Describe your plugin idea... (Enter to send)",
+    },
+    "help": {
+        "type": "card",
+        "card": {
+            "title": "Hamr Plugin Protocol",
+            "content": """## How Plugins Work
+
+Plugins are folders in `~/.config/hamr/plugins/` containing:
+
+### manifest.json
+```json
+{
+  "name": "My Plugin",
+  "description": "What it does",
+  "icon": "material_icon_name"
+}
+```
+
+### handler.py (executable)
+Communicates via JSON on stdin/stdout:
+
+**Input:** `{"step": "initial|search|action", "query": "...", "selected": {"id": "..."}}`
+
+**Output options:**
+- `{"type": "results", "results": [...]}`
+- `{"type": "card", "card": {"title": "...", "content": "...", "markdown": true}}`
+- `{"type": "execute", "execute": {"command": [...], "close": true}}`
+
+## Using This Plugin
+
+Just describe what you want to create! The AI will:
+1. Ask clarifying questions
+2. Discuss the approach
+3. Create the plugin when you confirm""",
+            "markdown": True,
+        },
+        "inputMode": "submit",
+        "placeholder": "Type your plugin idea... (Enter to send)",
+    },
+    "new_conversation": {
+        "type": "results",
+        "inputMode": "submit",
+        "results": [],
+        "placeholder": "Describe the plugin you want to create... (Enter to send)",
+        "clearInput": True,
+    },
+    "continue_empty": {
+        "type": "results",
+        "inputMode": "submit",
+        "results": [],
+        "placeholder": "Continue describing your plugin... (Enter to send)",
+    },
+}
+
+
+@lru_cache(maxsize=None)
+def static_response_bytes(name: str) -> bytes:
+    """Serialize a static response once"""
+    return json_dumps(STATIC_RESPONSES[name]) + b"\n"
+
+
+def write_response(data: bytes):
+    """Write response bytes straight to stdout, bypassing the text layer"""
+    sys.stdout.buffer.write(data)
+    sys.stdout.buffer.flush()
+
+
+def emit(response: dict):
+    """Write a response as compact JSON"""
+    write_response(json_dumps(response) + b"\n")
+
+
+def emit_static(name: str):
+    """Write a prebuilt static response"""
+    write_response(static_response_bytes(name))
+
+
+def main():
+    if sys.argv[1:2] == ["--watch-server"]:
+        watch_opencode_server(int(sys.argv[2]), int(sys.argv[3]))
         return
 
-    session = load_session()
+    # Empty stdin falls through to the initial step
+    raw = sys.stdin.buffer.read()
+    input_data = json_loads(raw) if raw.strip() else {}
+    step = input_data.get("step", "initial")
+    query = input_data.get("query", "").strip()
+    selected = input_data.get("selected", {})
+
+    # Check opencode availability
+    if not opencode_available():
+        emit_static("opencode_required")
+        return
 
     if step == "initial":
-        if session.get("messages"):
+        if has_messages():
             # Show option to continue or start fresh
-            print(
-                json.dumps(
-                    {
-                        "type": "results",
-                        "inputMode": "submit",
-                        "results": [
-                            {
-                                "id": "continue",
-                                "name": "Continue previous conversation",
-                                "description": "Resume where you left off",
-                                "icon": "history",
-                            },
-                            {
-                                "id": "new",
-                                "name": "Start new conversation",
-                                "description": "Clear history and start fresh",
-                                "icon": "add_circle",
-                            },
-                            {
-                                "id": "help",
-                                "name": "How plugins work",
-                                "description": "Learn about the plugin protocol",
-                                "icon": "help",
-                            },
-                        ],
-                        "placeholder": "Type your message and press Enter...",
-                    }
-                )
-            )
+            emit_static("initial_with_history")
         else:
-            print(
-                json.dumps(
-                    {
-                        "type": "results",
-                        "inputMode": "submit",
-                        "results": [
-                            {
-                                "id": "help",
-                                "name": "How plugins work",
-                                "description": "Learn about the plugin protocol",
-                                "icon": "help",
-                            },
-                        ],
-                        "placeholder": "Describe the plugin you want to create... (Enter to send)",
-                    }
-                )
-            )
+            emit_static("initial_new")
         return
 
     if step == "search":
@@ -441,46 +835,33 @@ See existing plugins for examples.""",
         # So we process the query directly as a message to the AI
         if not query:
             # Empty submit - just show results
-            print(
-                json.dumps(
-                    {
-                        "type": "results",
-                        "inputMode": "submit",
-                        "results": [],
-                        "placeholder": "Describe your plugin idea... (Enter to send)",
-                    }
-                )
-            )
+            emit_static("empty_search")
             return
 
         # Process the query as a message to the AI
+        session = load_session()
         success, payload = chat_with_opencode(query, session)
 
         if not success:
             # Add a system message so the timeline reflects the failure
-            session_messages = session.get("messages", [])
-            session_messages.append(
-                {
-                    "role": "system",
-                    "content": f"Failed to get response: {payload.get('error', 'Unknown error')}",
-                    "ts": int(time.time()),
-                }
-            )
-            session["messages"] = session_messages
-            save_session(session)
+            failure = {
+                "role": "system",
+                "content": f"Failed to get response: {payload.get('error', 'Unknown error')}",
+                "ts": int(time.time()),
+            }
+            session.setdefault("messages", []).append(failure)
+            append_messages([failure])
 
         card_payload = build_conversation_card(session, title="Create Plugin")
 
-        print(
-            json.dumps(
-                {
-                    "type": "card",
-                    "card": card_payload,
-                    "inputMode": "submit",
-                    "placeholder": "Type your reply... (Enter to send)",
-                    "clearInput": True,
-                }
-            )
+        emit(
+            {
+                "type": "card",
+                "card": card_payload,
+                "inputMode": "submit",
+                "placeholder": "Type your reply... (Enter to send)",
+                "clearInput": True,
+            }
         )
         return
 
@@ -488,92 +869,29 @@ See existing plugins for examples.""",
         item_id = selected.get("id", "")
 
         if item_id == "help":
-            print(
-                json.dumps(
-                    {
-                        "type": "card",
-                        "card": {
-                            "title": "Hamr Plugin Protocol",
-                            "content": """## How Plugins Work
-
-Plugins are folders in `~/.config/hamr/plugins/` containing:
-
-### manifest.json
-```json
-{
-  "name": "My Plugin",
-  "description": "What it does",
-  "icon": "material_icon_name"
-}
-```
-
-### handler.py (executable)
-Communicates via JSON on stdin/stdout:
-
-**Input:** `{"step": "initial|search|action", "query": "...", "selected": {"id": "..."}}`
-
-**Output options:**
-- `{"type": "results", "results": [...]}`
-- `{"type": "card", "card": {"title": "...", "content": "...", "markdown": true}}`
-- `{"type": "execute", "execute": {"command": [...], "close": true}}`
-
-## Using This Plugin
-
-Just describe what you want to create! The AI will:
-1. Ask clarifying questions
-2. Discuss the approach
-3. Create the plugin when you confirm""",
-                            "markdown": True,
-                        },
-                        "inputMode": "submit",
-                        "placeholder": "Type your plugin idea... (Enter to send)",
-                    }
-                )
-            )
+            emit_static("help")
             return
 
         if item_id == "new":
             clear_session()
-            session = {"messages": [], "state": "initial"}
-            print(
-                json.dumps(
-                    {
-                        "type": "results",
-                        "inputMode": "submit",
-                        "results": [],
-                        "placeholder": "Describe the plugin you want to create... (Enter to send)",
-                        "clearInput": True,
-                    }
-                )
-            )
+            save_state({"state": "initial"})
+            emit_static("new_conversation")
             return
 
         if item_id == "continue":
+            session = load_session()
             if session.get("messages"):
-                print(
-                    json.dumps(
-                        {
-                            "type": "card",
-                            "card": build_conversation_card(
-                                session, title="Create Plugin"
-                            ),
-                            "inputMode": "submit",
-                            "placeholder": "Type your reply... (Enter to send)",
-                            "clearInput": True,
-                        }
-                    )
+                emit(
+                    {
+                        "type": "card",
+                        "card": build_conversation_card(session, title="Create Plugin"),
+                        "inputMode": "submit",
+                        "placeholder": "Type your reply... (Enter to send)",
+                        "clearInput": True,
+                    }
                 )
             else:
-                print(
-                    json.dumps(
-                        {
-                            "type": "results",
-                            "inputMode": "submit",
-                            "results": [],
-                            "placeholder": "Continue describing your plugin... (Enter to send)",
-                        }
-                    )
-                )
+                emit_static("continue_empty")
             return
 
 
@@ -17,9 +17,10 @@ source "$SCRIPT_DIR/../test-helpers.sh"
 TEST_NAME="Create Plugin Tests"
 HANDLER="$SCRIPT_DIR/handler.py"
 
-# Session file location (same as handler.py)
-SESSION_FILE="$HOME/.cache/hamr/create-plugin-session.json"
-SESSION_BACKUP="/tmp/create-plugin-session-backup-$$.json"
+# Session transcript location (same as handler.py)
+SESSION_DIR="$HOME/.cache/hamr/create-plugin"
+SESSION_FILE="$SESSION_DIR/messages.jsonl"
+SESSION_BACKUP="/tmp/create-plugin-session-backup-$$"
 
 # ============================================================================
 # Setup / Teardown
@@ -27,28 +28,24 @@ SESSION_BACKUP="/tmp/create-plugin-session-backup-$$.json"
 
 setup() {
     # Backup existing session
-    if [[ -f "$SESSION_FILE" ]]; then
-        mkdir -p "$(dirname "$SESSION_BACKUP")"
-        cp "$SESSION_FILE" "$SESSION_BACKUP"
-    else
-        echo "{}" > "$SESSION_BACKUP"
+    rm -rf "$SESSION_BACKUP"
+    if [[ -d "$SESSION_DIR" ]]; then
+        cp -r "$SESSION_DIR" "$SESSION_BACKUP"
     fi
 }
 
 teardown() {
     # Restore original session
-    if [[ -f "$SESSION_BACKUP" ]]; then
-        mkdir -p "$(dirname "$SESSION_FILE")"
-        cp "$SESSION_BACKUP" "$SESSION_FILE"
-        rm -f "$SESSION_BACKUP"
-    else
-        rm -f "$SESSION_FILE"
+    rm -rf "$SESSION_DIR"
+    if [[ -d "$SESSION_BACKUP" ]]; then
+        cp -r "$SESSION_BACKUP" "$SESSION_DIR"
+        rm -rf "$SESSION_BACKUP"
     fi
 }
 
 before_each() {
     # Clear session before each test (start fresh)
-    rm -f "$SESSION_FILE"
+    rm -rf "$SESSION_DIR"
 }
 
 # ============================================================================
@@ -56,15 +53,25 @@ before_each() {
 # ============================================================================
 
 clear_session() {
-    rm -f "$SESSION_FILE"
+    rm -rf "$SESSION_DIR"
 }
 
 has_session() {
     [[ -f "$SESSION_FILE" ]]
 }
 
-get_session_file() {
-    cat "$SESSION_FILE" 2>/dev/null || echo "{}"
+# Write one message per line to the transcript
+write_messages() {
+    mkdir -p "$SESSION_DIR"
+    printf '%s\n' "$@" > "$SESSION_FILE"
+}
+
+count_messages() {
+    if [[ -f "$SESSION_FILE" ]]; then
+        grep -c . "$SESSION_FILE" || true
+    else
+        echo 0
+    fi
 }
 
 # ============================================================================
@@ -85,8 +92,7 @@ test_initial_first_time_shows_help_only() {
 test_initial_with_existing_conversation_shows_options() {
     clear_session
     # Simulate existing conversation by directly creating session with messages
-    mkdir -p "$(dirname "$SESSION_FILE")"
-    echo '{"messages": [{"role": "user", "content": "test", "ts": 1234567890}], "state": "initial"}' > "$SESSION_FILE"
+    write_messages '{"role": "user", "content": "test", "ts": 1234567890}'
     
     local result=$(hamr_test initial)
     
@@ -142,14 +148,12 @@ test_action_help_includes_protocol_info() {
 test_action_new_clears_session() {
     clear_session
     # Create a session first
-    mkdir -p "$(dirname "$SESSION_FILE")"
-    echo '{"messages": [{"role": "user", "content": "old", "ts": 1234567890}], "state": "initial"}' > "$SESSION_FILE"
+    write_messages '{"role": "user", "content": "old", "ts": 1234567890}'
     
     hamr_test action --id "new" > /dev/null
     
     # Session should be cleared
-    local messages=$(json_get "$(get_session_file)" '.messages | length')
-    assert_eq "$messages" "0"
+    assert_eq "$(count_messages)" "0"
 }
 
 test_action_new_returns_results() {
@@ -163,8 +167,7 @@ test_action_new_returns_results() {
 
 test_action_new_has_empty_results() {
     clear_session
-    mkdir -p "$(dirname "$SESSION_FILE")"
-    echo '{"messages": [{"role": "user", "content": "old", "ts": 1234567890}], "state": "initial"}' > "$SESSION_FILE"
+    write_messages '{"role": "user", "content": "old", "ts": 1234567890}'
     
     local result=$(hamr_test action --id "new")
     
@@ -174,8 +177,7 @@ test_action_new_has_empty_results() {
 
 test_action_continue_shows_conversation_card() {
     clear_session
-    mkdir -p "$(dirname "$SESSION_FILE")"
-    echo '{"messages": [{"role": "user", "content": "test message", "ts": 1234567890}], "state": "initial"}' > "$SESSION_FILE"
+    write_messages '{"role": "user", "content": "test message", "ts": 1234567890}'
     
     local result=$(hamr_test action --id "continue")
     
@@ -185,8 +187,8 @@ test_action_continue_shows_conversation_card() {
 
 test_action_continue_without_messages_shows_results() {
     clear_session
-    mkdir -p "$(dirname "$SESSION_FILE")"
-    echo '{"messages": [], "state": "initial"}' > "$SESSION_FILE"
+    mkdir -p "$SESSION_DIR"
+    : > "$SESSION_FILE"
     
     local result=$(hamr_test action --id "continue")
     
@@ -196,8 +198,7 @@ test_action_continue_without_messages_shows_results() {
 
 test_action_continue_clears_input() {
     clear_session
-    mkdir -p "$(dirname "$SESSION_FILE")"
-    echo '{"messages": [{"role": "user", "content": "test", "ts": 1234567890}], "state": "initial"}' > "$SESSION_FILE"
+    write_messages '{"role": "user", "content": "test", "ts": 1234567890}'
     
     local result=$(hamr_test action --id "continue")
     
@@ -271,13 +272,23 @@ test_session_file_created_on_action() {
     # Action with help should work and may create/modify session
     hamr_test action --id "help" > /dev/null
     
-    # Session file may or may not exist after help, but if it does, it should be valid JSON
+    # Transcript may or may not exist after help, but every line must be valid JSON
     if has_session; then
-        local session=$(get_session_file)
-        assert_contains "$session" "{"
+        assert_ok jq -e '.' "$SESSION_FILE"
     fi
 }
 
+test_search_appends_to_transcript() {
+    write_messages '{"role": "user", "content": "old", "ts": 1234567890}'
+    
+    hamr_test search --query "first" > /dev/null
+    hamr_test search --query "second" > /dev/null
+    
+    assert_eq "$(count_messages)" "5"
+    assert_eq "$(head -n 1 "$SESSION_FILE" | jq -r '.content')" "old"
+    assert_eq "$(tail -n 1 "$SESSION_FILE" | jq -r '.content')" "Mock AI response to: second"
+}
+
 test_initial_placeholder_mentions_enter() {
     clear_session
     local result=$(hamr_test initial)
@@ -286,6 +297,33 @@ test_initial_placeholder_mentions_enter() {
     assert_contains "$placeholder" "Enter"
 }
 
+test_first_reply_marks_system_prompt_sent() {
+    clear_session
+    
+    hamr_test search --query "hello" > /dev/null
+    assert_eq "$(jq -r '.system_prompt_sent' "$SESSION_DIR/state.json")" "true"
+    
+    hamr_test action --id "new" > /dev/null
+    assert_eq "$(jq -r '.system_prompt_sent' "$SESSION_DIR/state.json")" "null"
+}
+
+test_long_transcript_is_kept_but_card_is_capped() {
+    local lines=()
+    for i in $(seq 1 45); do
+        lines+=("{\"role\": \"user\", \"content\": \"msg $i\", \"ts\": 1234567890}")
+    done
+    write_messages "${lines[@]}"
+    
+    local result=$(hamr_test search --query "next")
+    
+    # Every message stays on disk; the card shows the newest 40
+    local messages=$(echo "$result" | jq '[.card.blocks[] | select(.type == "message")]')
+    assert_eq "$(count_messages)" "47" && \
+        assert_eq "$(echo "$messages" | jq 'length')" "40" && \
+        assert_eq "$(echo "$messages" | jq -r '.[0].content')" "msg 8" && \
+        assert_eq "$(echo "$result" | jq -r '.card.blocks[0].type')" "separator"
+}
+
 # ============================================================================
 # Run
 # ============================================================================
@@ -312,4 +350,7 @@ run_tests \
     test_action_help_has_content \
     test_all_responses_are_valid_json \
     test_session_file_created_on_action \
+    test_search_appends_to_transcript \
+    test_long_transcript_is_kept_but_card_is_capped \
+    test_first_reply_marks_system_prompt_sent \
     test_initial_placeholder_mentions_enter
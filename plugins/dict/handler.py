@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """
 Dictionary workflow handler - looks up word definitions using Free Dictionary API
+
+python-orjson is used for faster JSON parsing and output when installed (optional).
 """
 
 import json
@@ -8,10 +10,24 @@ import os
 import sys
 import urllib.request
 import urllib.error
+from pathlib import Path
+from urllib.parse import quote
+
+# Optional orjson for faster JSON parsing
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Test mode - return mock data instead of calling real API
 TEST_MODE = os.environ.get("HAMR_TEST_MODE") == "1"
 
+# Raw API responses, one file per looked-up word
+CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "hamr" / "dict"
+)
+MAX_CACHED_WORDS = 500
+
 # Mock definitions for common test words
 MOCK_DEFINITIONS = {
     "hello": {
@@ -131,23 +147,74 @@ MOCK_DEFINITIONS = {
 }
 
 
+def json_loads(data: str | bytes):
+    """Parse JSON with orjson when available"""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj) -> bytes:
+    """Serialize to compact UTF-8 JSON with orjson when available"""
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def emit(response: dict):
+    """Write a response as one JSON line straight to stdout"""
+    sys.stdout.buffer.write(json_dumps(response) + b"\n")
+    sys.stdout.buffer.flush()
+
+
 def get_definition(word: str) -> dict | None:
     """Fetch word definition from Free Dictionary API (or mock in test mode)"""
     if TEST_MODE:
         # Return mock data in test mode
         return MOCK_DEFINITIONS.get(word.lower())
 
-    url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
+    cache_path = CACHE_DIR / f"{quote(word.lower(), safe='')}.json"
+    try:
+        body = cache_path.read_bytes()
+        # Mark the word as recently used so eviction keeps it
+        os.utime(cache_path)
+    except OSError:
+        body = None
+
     try:
-        with urllib.request.urlopen(url, timeout=5) as response:
-            data = json.loads(response.read().decode())
-            if data and len(data) > 0:
-                return data[0]
-    except (urllib.error.URLError, urllib.error.HTTPError, json.JSONDecodeError):
+        if body is None:
+            url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                body = response.read()
+            save_cached_definition(cache_path, body)
+        data = json_loads(body)
+        if data and len(data) > 0:
+            return data[0]
+    except ValueError:
+        cache_path.unlink(missing_ok=True)
+    except (urllib.error.URLError, urllib.error.HTTPError):
         pass
     return None
 
 
+def save_cached_definition(cache_path: Path, body: bytes):
+    """Store a raw API response, evicting least recently used words over the cap"""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(".tmp")
+        tmp_path.write_bytes(body)
+        os.replace(tmp_path, cache_path)
+
+        # Skip temporary files another lookup may still be writing
+        entries = [e for e in os.scandir(CACHE_DIR) if e.name.endswith(".json")]
+        if len(entries) > MAX_CACHED_WORDS:
+            entries.sort(key=lambda e: e.stat().st_mtime)
+            for entry in entries[: len(entries) - MAX_CACHED_WORDS]:
+                os.unlink(entry.path)
+    except OSError:
+        pass
+
+
 def format_definition(data: dict) -> str:
     """Format dictionary data into readable markdown"""
     word = data.get("word", "")
@@ -180,7 +247,8 @@ def format_definition(data: dict) -> str:
 
 
 def main():
-    input_data = json.load(sys.stdin)
+    raw = sys.stdin.buffer.read()
+    input_data = json_loads(raw) if raw.strip() else {}
     step = input_data.get("step", "initial")
     query = input_data.get("query", "").strip()
     selected = input_data.get("selected", {})
@@ -188,18 +256,12 @@ def main():
 
     if step == "initial":
         # Just started - prompt for input
-        print(
-            json.dumps(
-                {"type": "prompt", "prompt": {"text": "Enter word to define..."}}
-            )
-        )
+        emit({"type": "prompt", "prompt": {"text": "Enter word to define..."}})
         return
 
     if step == "search":
         if not query:
-            print(
-                json.dumps({"type": "results", "results": [], "inputMode": "realtime"})
-            )
+            emit({"type": "results", "results": [], "inputMode": "realtime"})
             return
 
         # Look up the word
@@ -210,42 +272,38 @@ def main():
             content = format_definition(data)
             word = data.get("word", query)
 
-            print(
-                json.dumps(
-                    {
-                        "type": "card",
-                        "card": {
-                            "content": content,
-                            "markdown": True,
-                            "actions": [
-                                {
-                                    "id": "copy",
-                                    "name": "Copy",
-                                    "icon": "content_copy",
-                                },
-                            ],
-                        },
-                        "inputMode": "realtime",
-                        "context": word,  # Store word for copy action
-                    }
-                )
+            emit(
+                {
+                    "type": "card",
+                    "card": {
+                        "content": content,
+                        "markdown": True,
+                        "actions": [
+                            {
+                                "id": "copy",
+                                "name": "Copy",
+                                "icon": "content_copy",
+                            },
+                        ],
+                    },
+                    "inputMode": "realtime",
+                    "context": word,  # Store word for copy action
+                }
             )
         else:
             # No definition found
-            print(
-                json.dumps(
-                    {
-                        "type": "results",
-                        "results": [
-                            {
-                                "id": "__not_found__",
-                                "name": f"No definition found for '{query}'",
-                                "icon": "search_off",
-                            }
-                        ],
-                        "inputMode": "realtime",
-                    }
-                )
+            emit(
+                {
+                    "type": "results",
+                    "results": [
+                        {
+                            "id": "__not_found__",
+                            "name": f"No definition found for '{query}'",
+                            "icon": "search_off",
+                        }
+                    ],
+                    "inputMode": "realtime",
+                }
             )
         return
 
@@ -260,7 +318,7 @@ def main():
         if action == "copy" or item_id == "copy":
             word = context if context else query
             if word:
-                # Re-fetch definition for copy
+                # Served from the disk cache filled by the search step
                 data = get_definition(word)
                 if data:
                     content = format_definition(data)
@@ -268,18 +326,17 @@ def main():
                     if not TEST_MODE:
                         import subprocess
 
-                        subprocess.run(["wl-copy", content], check=False)
+                        copier = subprocess.Popen(["wl-copy"], stdin=subprocess.PIPE)
+                        copier.communicate(content.encode())
 
-                    print(
-                        json.dumps(
-                            {
-                                "type": "execute",
-                                "execute": {
-                                    "notify": f"Definition of '{word}' copied",
-                                    "close": True,
-                                },
-                            }
-                        )
+                    emit(
+                        {
+                            "type": "execute",
+                            "execute": {
+                                "notify": f"Definition of '{word}' copied",
+                                "close": True,
+                            },
+                        }
                     )
             return
 
@@ -4,46 +4,241 @@ Notes workflow handler - quick notes with CRUD operations.
 Features: list, add, view, edit, delete, copy
 
 Uses the Form API for multi-field input (title + content).
+
+python-orjson is used for faster JSON reading and writing when installed (optional).
 """
 
 import json
 import os
+import pickle
 import subprocess
 import sys
 import time
 from pathlib import Path
 
-# Notes file location
+# Optional orjson for faster notes (de)serialization
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Notes file location: a full snapshot plus an append-only log of changes since
 CONFIG_DIR = Path(os.environ.get("XDG_CONFIG_HOME", Path.home() / ".config"))
 NOTES_FILE = CONFIG_DIR / "hamr" / "notes.json"
+NOTES_TMP_FILE = CONFIG_DIR / "hamr" / "notes.json.tmp"
+NOTES_LOG_FILE = CONFIG_DIR / "hamr" / "notes.log.jsonl"
+# The log is folded into the snapshot once it outgrows it (or this floor)
+LOG_COMPACT_MIN_BYTES = 64 * 1024
+
+# Parsed notes are cached between invocations, keyed by the files' mtime and size
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "hamr"
+NOTES_CACHE_PATH = CACHE_DIR / "notes.pickle"
+# Bump when the shape of cached note dicts changes
+NOTES_CACHE_VERSION = 1
+# Ids matched by the previous search keystroke, narrowed when the query grows
+SEARCH_CACHE_PATH = CACHE_DIR / "notes-search.pickle"
+
+# Daemon mode: notes kept in memory between requests, keyed like the pickle
+_notes_memo: tuple | None = None
+# Results for the last rendered note list, reused while that list is unchanged
+_results_cache: tuple | None = None
+
+# Response pieces that never change, shared by every result and card
+PLUGIN_ACTIONS = [
+    {
+        "id": "add",
+        "name": "Add Note",
+        "icon": "add_circle",
+        "shortcut": "Ctrl+1",
+    }
+]
+NOTE_ACTIONS = [
+    {"id": "view", "name": "View", "icon": "visibility"},
+    {"id": "edit", "name": "Edit", "icon": "edit"},
+    {"id": "copy", "name": "Copy", "icon": "content_copy"},
+    {"id": "delete", "name": "Delete", "icon": "delete"},
+]
+PREVIEW_ACTIONS = [
+    {"id": "edit", "name": "Edit", "icon": "edit"},
+    {"id": "copy", "name": "Copy", "icon": "content_copy"},
+]
+CARD_ACTIONS = [
+    {"id": "edit", "name": "Edit", "icon": "edit"},
+    {"id": "copy", "name": "Copy", "icon": "content_copy"},
+    {"id": "delete", "name": "Delete", "icon": "delete"},
+    {"id": "back", "name": "Back", "icon": "arrow_back"},
+]
+ADD_RESULT = {
+    "id": "__add__",
+    "name": "Add new note...",
+    "icon": "add_circle",
+    "description": "Create a new note",
+}
+EMPTY_RESULT = {
+    "id": "__empty__",
+    "name": "No notes yet",
+    "icon": "info",
+    "description": "Click 'Add new note' to get started",
+}
+
+
+def json_loads(data: str | bytes):
+    """Parse JSON with orjson when available"""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj) -> bytes:
+    """Serialize to compact UTF-8 JSON with orjson when available"""
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def read_cache(path: Path, key):
+    """Return cached data if it was stored under the given key, else None"""
+    try:
+        with open(path, "rb") as f:
+            cached_key, data = pickle.load(f)
+    except Exception:
+        return None
+    return data if cached_key == key else None
+
+
+def write_cache(path: Path, key, data) -> None:
+    """Store data alongside the key it was built from"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump((key, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def get_notes_key() -> tuple:
+    """Cache version plus (mtime_ns, size) of the snapshot and log, None if missing"""
+    key = [NOTES_CACHE_VERSION]
+    for path in (NOTES_FILE, NOTES_LOG_FILE):
+        try:
+            st = path.stat()
+            key.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            key.append(None)
+    return tuple(key)
 
 
 def load_notes() -> list[dict]:
-    """Load notes from file"""
-    if not NOTES_FILE.exists():
-        return []
+    """Load notes, reusing the parsed cache while the files are unchanged"""
+    global _notes_memo
+    key = get_notes_key()
+    if _notes_memo and _notes_memo[0] == key:
+        return _notes_memo[1]
+    notes = read_cache(NOTES_CACHE_PATH, key)
+    if notes is None:
+        notes = read_notes_files()
+        write_cache(NOTES_CACHE_PATH, key, notes)
+    _notes_memo = (key, notes)
+    return notes
+
+
+def read_notes_files() -> list[dict]:
+    """Load the notes snapshot and replay the change log over it"""
+    notes_by_id: dict[str, dict] = {}
     try:
-        with open(NOTES_FILE) as f:
-            data = json.load(f)
-            return data.get("notes", [])
-    except (json.JSONDecodeError, IOError):
-        return []
+        with open(NOTES_FILE, "rb") as f:
+            for note in json_loads(f.read()).get("notes", []):
+                notes_by_id[note.get("id", "")] = note
+    except (ValueError, IOError):
+        pass
+
+    try:
+        with open(NOTES_LOG_FILE, "rb") as f:
+            for line in f:
+                try:
+                    record = json_loads(line)
+                except ValueError:
+                    continue  # Torn write from an interrupted append
+                if record.get("op") == "del":
+                    notes_by_id.pop(record.get("id", ""), None)
+                elif record.get("op") == "put":
+                    note = record.get("note", {})
+                    notes_by_id[note.get("id", "")] = note
+    except IOError:
+        pass
+
+    for note in notes_by_id.values():
+        note["_search"] = search_text(note)
+
+    # Newest first; cached in this order so renders don't need to sort
+    return sorted(notes_by_id.values(), key=lambda n: n.get("updated", 0), reverse=True)
+
+
+def search_text(note: dict) -> str:
+    """Lowercased title and content that search queries are matched against"""
+    return f"{note.get('title', '')}\x1f{note.get('content', '')}".lower()
+
+
+def stored_note(note: dict) -> dict:
+    """Note without the in-memory search text, as written to disk"""
+    return {k: v for k, v in note.items() if k != "_search"}
 
 
 def save_notes(notes: list[dict]) -> bool:
-    """Save notes to file"""
+    """Write a full snapshot and empty the change log it now covers"""
     try:
         NOTES_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(NOTES_FILE, "w") as f:
-            json.dump({"notes": notes}, f, indent=2)
+        data = json_dumps({"notes": [stored_note(n) for n in notes]})
+        # Replace atomically so an interrupted save never leaves a partial file
+        with open(NOTES_TMP_FILE, "wb") as f:
+            f.write(data)
+            os.fsync(f.fileno())
+        os.replace(NOTES_TMP_FILE, NOTES_FILE)
+        # Truncate rather than delete so file watchers keep tracking the log
+        open(NOTES_LOG_FILE, "wb").close()
         return True
     except IOError:
         return False
 
 
+def record_note_change(record: dict, notes: list[dict]) -> bool:
+    """Append one put/del record to the log, compacting when it grows too big
+
+    notes is the full list after the change, used when a snapshot is due.
+    """
+    global _notes_memo
+    _notes_memo = None  # The caller may have changed the loaded notes in place
+    if record.get("op") == "put":
+        note = record["note"]
+        note["_search"] = search_text(note)
+        record = {"op": "put", "note": stored_note(note)}
+
+    try:
+        log_size = NOTES_LOG_FILE.stat().st_size
+        snapshot_size = NOTES_FILE.stat().st_size
+        compact = log_size > max(snapshot_size, LOG_COMPACT_MIN_BYTES)
+    except OSError:
+        compact = True
+
+    if compact:
+        if not save_notes(notes):
+            return False
+    else:
+        try:
+            with open(NOTES_LOG_FILE, "ab") as f:
+                f.write(json_dumps(record) + b"\n")
+        except IOError:
+            return False
+
+    write_cache(NOTES_CACHE_PATH, get_notes_key(), notes)
+    return True
+
+
 def generate_id() -> str:
     """Generate a unique ID for a note"""
-    return f"note_{int(time.time() * 1000)}"
+    return f"note_{time.time_ns()}"
 
 
 def truncate(text: str, max_len: int = 60) -> str:
@@ -57,41 +252,34 @@ def get_plugin_actions(in_form_mode: bool = False) -> list[dict]:
     """Get plugin-level actions for the action bar"""
     if in_form_mode:
         return []  # No actions while in form
-    return [
-        {
-            "id": "add",
-            "name": "Add Note",
-            "icon": "add_circle",
-            "shortcut": "Ctrl+1",
-        }
-    ]
+    return PLUGIN_ACTIONS
 
 
 def get_note_results(notes: list[dict], show_add: bool = False) -> list[dict]:
-    """Convert notes to result format"""
+    """Convert notes to result format
+
+    Rendering the same list object again returns the previous results, so
+    callers replace the list (or change its length) when a note changes.
+    """
+    global _results_cache
+    key = (len(notes), show_add)
+    if _results_cache and _results_cache[0] is notes and _results_cache[1] == key:
+        return _results_cache[2]
+
     results = []
 
     # Add option is now in plugin action bar, but keep for legacy support
     if show_add:
-        results.append(
-            {
-                "id": "__add__",
-                "name": "Add new note...",
-                "icon": "add_circle",
-                "description": "Create a new note",
-            }
-        )
+        results.append(ADD_RESULT)
 
-    # Sort notes by updated time (most recent first)
-    sorted_notes = sorted(notes, key=lambda n: n.get("updated", 0), reverse=True)
-
-    for note in sorted_notes:
+    # Notes are kept most recently updated first (see read_notes_files)
+    for note in notes:
         note_id = note.get("id", "")
         title = note.get("title", "Untitled")
         content = note.get("content", "")
 
         # Show first line of content as description
-        first_line = content.split("\n")[0] if content else ""
+        first_line = content.partition("\n")[0]
         description = truncate(first_line, 50) if first_line else "Empty note"
 
         results.append(
@@ -105,31 +293,17 @@ def get_note_results(notes: list[dict], show_add: bool = False) -> list[dict]:
                     "type": "markdown",
                     "content": format_note_card(note),
                     "title": title,
-                    "actions": [
-                        {"id": "edit", "name": "Edit", "icon": "edit"},
-                        {"id": "copy", "name": "Copy", "icon": "content_copy"},
-                    ],
+                    "actions": PREVIEW_ACTIONS,
                     "detachable": True,
                 },
-                "actions": [
-                    {"id": "view", "name": "View", "icon": "visibility"},
-                    {"id": "edit", "name": "Edit", "icon": "edit"},
-                    {"id": "copy", "name": "Copy", "icon": "content_copy"},
-                    {"id": "delete", "name": "Delete", "icon": "delete"},
-                ],
+                "actions": NOTE_ACTIONS,
             }
         )
 
     if not notes and show_add:
-        results.append(
-            {
-                "id": "__empty__",
-                "name": "No notes yet",
-                "icon": "info",
-                "description": "Click 'Add new note' to get started",
-            }
-        )
+        results.append(EMPTY_RESULT)
 
+    _results_cache = (notes, key, results)
     return results
 
 
@@ -138,12 +312,21 @@ def filter_notes(query: str, notes: list[dict]) -> list[dict]:
     if not query:
         return notes
     query_lower = query.lower()
-    return [
-        n
-        for n in notes
-        if query_lower in n.get("title", "").lower()
-        or query_lower in n.get("content", "").lower()
-    ]
+    return [n for n in notes if query_lower in n["_search"]]
+
+
+def search_notes(query: str, notes: list[dict], notes_by_id: dict) -> list[dict]:
+    """Filter notes, rescanning only the last matches when the query extends them"""
+    if not query:
+        return notes
+    query_lower = query.lower()
+    key = get_notes_key()
+    last = read_cache(SEARCH_CACHE_PATH, key)
+    if last and query_lower.startswith(last[0]):
+        notes = [notes_by_id[i] for i in last[1] if i in notes_by_id]
+    matches = filter_notes(query, notes)
+    write_cache(SEARCH_CACHE_PATH, key, (query_lower, [n.get("id") for n in matches]))
+    return matches
 
 
 def format_note_card(note: dict) -> str:
@@ -154,8 +337,24 @@ def format_note_card(note: dict) -> str:
 
 
 def respond(response: dict):
-    """Send JSON response"""
-    print(json.dumps(response))
+    """Send JSON response as one pre-encoded write"""
+    sys.stdout.buffer.write(json_dumps(response))
+
+
+def respond_note_list(notes: list[dict], navigate_back: bool = False):
+    """Return to the full note list with a cleared search field"""
+    response = {
+        "type": "results",
+        "results": get_note_results(notes),
+        "inputMode": "realtime",
+        "clearInput": True,
+        "context": "",
+        "placeholder": "Search notes...",
+        "pluginActions": get_plugin_actions(),
+    }
+    if navigate_back:
+        response["navigateBack"] = True
+    respond(response)
 
 
 def show_add_form(title_default: str = "", content_default: str = ""):
@@ -229,7 +428,7 @@ def note_to_index_item(note: dict) -> dict:
     note_id = note.get("id", "")
     title = note.get("title", "Untitled")
     content = note.get("content", "")
-    first_line = content.split("\n")[0] if content else ""
+    first_line = content.partition("\n")[0]
     return {
         "id": f"notes:{note_id}",
         "name": title,
@@ -255,8 +454,7 @@ def note_to_index_item(note: dict) -> dict:
     }
 
 
-def main():
-    input_data = json.load(sys.stdin)
+def handle(input_data: dict):
     step = input_data.get("step", "initial")
     query = input_data.get("query", "").strip()
     selected = input_data.get("selected", {})
@@ -264,7 +462,32 @@ def main():
     context = input_data.get("context", "")
     form_data = input_data.get("formData", {})
 
+    # Actions that only open a form or ignore the click don't need the notes
+    if step == "action":
+        item_id = selected.get("id", "")
+
+        # Plugin-level action: add (from action bar)
+        if item_id == "__plugin__" and action == "add":
+            show_add_form()
+            return
+
+        # Info items - not actionable
+        if item_id in ("__info__", "__current__", "__empty__"):
+            return
+
+        # Start adding new note - show form
+        if item_id == "__add__":
+            show_add_form()
+            return
+
+        # Quick add from search - show form with title prefilled
+        if item_id.startswith("__add_quick__:"):
+            title = item_id.split(":", 1)[1]
+            show_add_form(title_default=title)
+            return
+
     notes = load_notes()
+    notes_by_id = {n.get("id"): n for n in notes}
 
     if step == "index":
         mode = input_data.get("mode", "full")
@@ -285,20 +508,18 @@ def main():
             # Find removed items
             removed_ids = list(indexed_ids - current_ids)
 
-            print(
-                json.dumps(
-                    {
-                        "type": "index",
-                        "mode": "incremental",
-                        "items": new_items,
-                        "remove": removed_ids,
-                    }
-                )
+            respond(
+                {
+                    "type": "index",
+                    "mode": "incremental",
+                    "items": new_items,
+                    "remove": removed_ids,
+                }
             )
         else:
             # Full reindex
             items = [note_to_index_item(n) for n in notes]
-            print(json.dumps({"type": "index", "items": items}))
+            respond({"type": "index", "items": items})
         return
 
     if step == "initial":
@@ -314,7 +535,7 @@ def main():
         return
 
     if step == "search":
-        filtered = filter_notes(query, notes)
+        filtered = search_notes(query, notes, notes_by_id)
         results = []
 
         if query:
@@ -348,27 +569,17 @@ def main():
             content = form_data.get("content", "")
 
             if title:
+                now_ms = time.time_ns() // 1_000_000
                 new_note = {
                     "id": generate_id(),
                     "title": title,
                     "content": content,
-                    "created": int(time.time() * 1000),
-                    "updated": int(time.time() * 1000),
+                    "created": now_ms,
+                    "updated": now_ms,
                 }
-                notes.append(new_note)
-                if save_notes(notes):
-                    respond(
-                        {
-                            "type": "results",
-                            "results": get_note_results(notes),
-                            "inputMode": "realtime",
-                            "clearInput": True,
-                            "context": "",
-                            "placeholder": "Search notes...",
-                            "pluginActions": get_plugin_actions(),
-                            "navigateBack": True,
-                        }
-                    )
+                notes.insert(0, new_note)
+                if record_note_change({"op": "put", "note": new_note}, notes):
+                    respond_note_list(notes, navigate_back=True)
                 else:
                     respond({"type": "error", "message": "Failed to save note"})
             else:
@@ -378,7 +589,7 @@ def main():
         # Editing existing note
         if context.startswith("__edit__:"):
             note_id = context.split(":", 1)[1]
-            note = next((n for n in notes if n.get("id") == note_id), None)
+            note = notes_by_id.get(note_id)
 
             if not note:
                 respond({"type": "error", "message": "Note not found"})
@@ -390,20 +601,10 @@ def main():
             if title:
                 note["title"] = title
                 note["content"] = content
-                note["updated"] = int(time.time() * 1000)
-                if save_notes(notes):
-                    respond(
-                        {
-                            "type": "results",
-                            "results": get_note_results(notes),
-                            "inputMode": "realtime",
-                            "clearInput": True,
-                            "context": "",
-                            "placeholder": "Search notes...",
-                            "pluginActions": get_plugin_actions(),
-                            "navigateBack": True,
-                        }
-                    )
+                note["updated"] = time.time_ns() // 1_000_000
+                notes = [note] + [n for n in notes if n is not note]
+                if record_note_change({"op": "put", "note": note}, notes):
+                    respond_note_list(notes, navigate_back=True)
                 else:
                     respond({"type": "error", "message": "Failed to save note"})
             else:
@@ -411,59 +612,17 @@ def main():
             return
 
     if step == "action":
-        item_id = selected.get("id", "")
-
-        # Plugin-level action: add (from action bar)
-        if item_id == "__plugin__" and action == "add":
-            show_add_form()
-            return
-
         # Form cancelled - return to list
         if item_id == "__form_cancel__":
-            respond(
-                {
-                    "type": "results",
-                    "results": get_note_results(notes),
-                    "inputMode": "realtime",
-                    "clearInput": True,
-                    "context": "",
-                    "placeholder": "Search notes...",
-                    "pluginActions": get_plugin_actions(),
-                }
-            )
-            return
-
-        # Info items - not actionable
-        if item_id in ("__info__", "__current__", "__empty__"):
+            respond_note_list(notes)
             return
 
         # Back navigation (from Escape key or back button)
         if item_id == "__back__" or action == "back":
-            respond(
-                {
-                    "type": "results",
-                    "results": get_note_results(notes),
-                    "inputMode": "realtime",
-                    "clearInput": True,
-                    "context": "",
-                    "placeholder": "Search notes...",
-                    "pluginActions": get_plugin_actions(),
-                }
-            )
+            respond_note_list(notes)
             return
 
-        # Start adding new note - show form
-        if item_id == "__add__":
-            show_add_form()
-            return
-
-        # Quick add from search - show form with title prefilled
-        if item_id.startswith("__add_quick__:"):
-            title = item_id.split(":", 1)[1]
-            show_add_form(title_default=title)
-            return
-
-        note = next((n for n in notes if n.get("id") == item_id), None)
+        note = notes_by_id.get(item_id)
         if not note:
             respond({"type": "error", "message": f"Note not found: {item_id}"})
             return
@@ -476,12 +635,7 @@ def main():
                     "card": {
                         "content": format_note_card(note),
                         "markdown": True,
-                        "actions": [
-                            {"id": "edit", "name": "Edit", "icon": "edit"},
-                            {"id": "copy", "name": "Copy", "icon": "content_copy"},
-                            {"id": "delete", "name": "Delete", "icon": "delete"},
-                            {"id": "back", "name": "Back", "icon": "arrow_back"},
-                        ],
+                        "actions": CARD_ACTIONS,
                     },
                     "context": item_id,  # Store note ID for card actions
                 }
@@ -496,7 +650,19 @@ def main():
         # Copy action
         if action == "copy":
             content = f"{note.get('title', '')}\n\n{note.get('content', '')}"
-            subprocess.run(["wl-copy", content], check=False)
+            # wl-copy forks to serve the clipboard; hand it the text and move on
+            copier = subprocess.Popen(
+                ["wl-copy"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+            try:
+                copier.stdin.write(content.encode())
+                copier.stdin.close()
+            except BrokenPipeError:
+                pass
             respond(
                 {
                     "type": "execute",
@@ -510,19 +676,10 @@ def main():
 
         # Delete action
         if action == "delete":
-            notes = [n for n in notes if n.get("id") != item_id]
-            if save_notes(notes):
-                respond(
-                    {
-                        "type": "results",
-                        "results": get_note_results(notes),
-                        "inputMode": "realtime",
-                        "clearInput": True,
-                        "context": "",
-                        "placeholder": "Search notes...",
-                        "pluginActions": get_plugin_actions(),
-                    }
-                )
+            del notes_by_id[item_id]
+            notes = list(notes_by_id.values())
+            if record_note_change({"op": "del", "id": item_id}, notes):
+                respond_note_list(notes)
             else:
                 respond({"type": "error", "message": "Failed to delete note"})
             return
@@ -531,5 +688,31 @@ def main():
     respond({"type": "error", "message": f"Unknown step: {step}"})
 
 
+def serve():
+    """Answer newline-delimited JSON requests until stdin closes.
+
+    Every request gets exactly one response line (empty if the step has
+    no output) so the launcher can match replies to requests.
+    """
+    for line in sys.stdin.buffer:
+        if not line.strip():
+            continue
+        try:
+            handle(json_loads(line))
+        except Exception as e:
+            respond({"type": "error", "message": str(e)})
+        sys.stdout.buffer.write(b"\n")
+        sys.stdout.buffer.flush()
+
+
+def main():
+    if "--daemon" in sys.argv[1:]:
+        serve()
+        return
+    raw = sys.stdin.buffer.read()
+    handle(json_loads(raw) if raw.strip() else {})
+    sys.stdout.buffer.flush()
+
+
 if __name__ == "__main__":
     main()
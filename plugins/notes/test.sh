@@ -30,7 +30,9 @@ HANDLER="$SCRIPT_DIR/handler.py"
 # Notes file location (same as handler.py)
 CONFIG_DIR="${XDG_CONFIG_HOME:-$HOME/.config}"
 NOTES_FILE="$CONFIG_DIR/hamr/notes.json"
+NOTES_LOG_FILE="$CONFIG_DIR/hamr/notes.log.jsonl"
 BACKUP_FILE="/tmp/notes-test-backup-$$.json"
+BACKUP_LOG_FILE="/tmp/notes-test-backup-$$.log.jsonl"
 
 # ============================================================================
 # Setup / Teardown
@@ -43,19 +45,29 @@ setup() {
     else
         echo '{"notes": []}' > "$BACKUP_FILE"
     fi
+    if [[ -f "$NOTES_LOG_FILE" ]]; then
+        cp "$NOTES_LOG_FILE" "$BACKUP_LOG_FILE"
+    fi
 }
 
 teardown() {
     # Restore original notes
     mkdir -p "$(dirname "$NOTES_FILE")"
     cp "$BACKUP_FILE" "$NOTES_FILE"
-    rm -f "$BACKUP_FILE"
+    rm -f "$BACKUP_FILE" "$NOTES_LOG_FILE"
+    if [[ -f "$BACKUP_LOG_FILE" ]]; then
+        mv "$BACKUP_LOG_FILE" "$NOTES_LOG_FILE"
+    fi
 }
 
 before_each() {
     # Reset to backup state before each test
     mkdir -p "$(dirname "$NOTES_FILE")"
     cp "$BACKUP_FILE" "$NOTES_FILE"
+    rm -f "$NOTES_LOG_FILE"
+    if [[ -f "$BACKUP_LOG_FILE" ]]; then
+        cp "$BACKUP_LOG_FILE" "$NOTES_LOG_FILE"
+    fi
 }
 
 # ============================================================================
@@ -65,6 +77,7 @@ before_each() {
 set_notes() {
     mkdir -p "$(dirname "$NOTES_FILE")"
     echo "$1" > "$NOTES_FILE"
+    rm -f "$NOTES_LOG_FILE"
 }
 
 clear_notes() {
@@ -75,12 +88,30 @@ get_notes_file() {
     cat "$NOTES_FILE"
 }
 
+# Current notes: the snapshot with the change log replayed over it
+get_current_notes() {
+    { cat "$NOTES_FILE"; [[ -f "$NOTES_LOG_FILE" ]] && cat "$NOTES_LOG_FILE"; } | jq -s '
+        . as $files
+        | reduce $files[0].notes[] as $n ({}; .[$n.id] = $n)
+        | reduce $files[1:][] as $r (.;
+            if $r.op == "del" then del(.[$r.id]) else .[$r.note.id] = $r.note end)
+        | [.[]]'
+}
+
 get_note_count() {
-    jq '.notes | length' "$NOTES_FILE"
+    get_current_notes | jq 'length'
 }
 
 get_first_note() {
-    jq '.notes[0]' "$NOTES_FILE"
+    get_current_notes | jq '.[0]'
+}
+
+get_log_count() {
+    if [[ -f "$NOTES_LOG_FILE" ]]; then
+        wc -l < "$NOTES_LOG_FILE" | tr -d ' '
+    else
+        echo 0
+    fi
 }
 
 # ============================================================================
@@ -126,6 +157,18 @@ test_initial_notes_sorted_by_updated_desc() {
     assert_eq "$first_note_id" "note_2" "Most recent note should appear first"
 }
 
+test_edited_note_moves_to_top() {
+    local notes='{"notes": [
+        {"id": "note_1", "title": "Old Note", "content": "First", "created": 1000, "updated": 1000},
+        {"id": "note_2", "title": "New Note", "content": "Second", "created": 2000, "updated": 2000}
+    ]}'
+    set_notes "$notes"
+    local result=$(hamr_test form --data '{"title": "Old Note", "content": "Edited"}' --context "__edit__:note_1")
+
+    assert_eq "$(json_get "$result" '.results[0].id')" "note_1"
+    assert_eq "$(json_get "$(hamr_test initial)" '.results[0].id')" "note_1"
+}
+
 test_search_filters_by_title() {
     local notes='{"notes": [
         {"id": "note_1", "title": "Buy Groceries", "content": "Milk, eggs", "created": 1000, "updated": 1000},
@@ -150,6 +193,23 @@ test_search_filters_by_content() {
     assert_not_contains "$result" "Todo"
 }
 
+test_search_as_you_type_matches_full_search() {
+    local notes='{"notes": [
+        {"id": "note_1", "title": "Buy Groceries", "content": "Milk, eggs", "created": 1000, "updated": 1000},
+        {"id": "note_2", "title": "Call Mom", "content": "Remember to buy flowers", "created": 2000, "updated": 2000}
+    ]}'
+    set_notes "$notes"
+    hamr_test search --query "bu" > /dev/null
+    local result=$(hamr_test search --query "buy f")
+    assert_has_result "$result" "note_2"
+    assert_no_result "$result" "note_1"
+
+    # A query that doesn't extend the last one searches every note again
+    result=$(hamr_test search --query "milk")
+    assert_has_result "$result" "note_1"
+    assert_no_result "$result" "note_2"
+}
+
 test_search_empty_query_shows_all() {
     local notes='{"notes": [
         {"id": "note_1", "title": "Note One", "content": "Content", "created": 1000, "updated": 1000},
@@ -422,6 +482,38 @@ test_action_delete_removes_note() {
     assert_eq "$(get_note_count)" "1"
 }
 
+test_changes_are_appended_to_log() {
+    local notes='{"notes": [{"id": "note_1", "title": "First", "content": "Content", "created": 1000, "updated": 1000}]}'
+    set_notes "$notes"
+    # First change writes a snapshot and starts an empty log
+    hamr_test form --data '{"title": "Second", "content": ""}' --context "__add__" > /dev/null
+    assert_eq "$(get_log_count)" "0"
+    assert_eq "$(jq '.notes | length' "$NOTES_FILE")" "2"
+
+    hamr_test form --data '{"title": "Edited", "content": ""}' --context "__edit__:note_1" > /dev/null
+    hamr_test action --id "note_1" --action "delete" > /dev/null
+    assert_eq "$(get_log_count)" "2"
+    assert_eq "$(jq '.notes | length' "$NOTES_FILE")" "2"
+
+    local result=$(hamr_test initial)
+    assert_not_contains "$result" "Edited"
+    assert_contains "$result" "Second"
+    assert_eq "$(get_note_count)" "1"
+}
+
+test_large_log_is_compacted() {
+    local notes='{"notes": [{"id": "note_1", "title": "Title", "content": "Content", "created": 1000, "updated": 1000}]}'
+    set_notes "$notes"
+    local big=$(head -c 70000 /dev/zero | tr '\0' 'x')
+    jq -nc --arg content "$big" '{"op": "put", "note": {"id": "note_2", "title": "Big", "content": $content, "created": 2000, "updated": 2000}}' > "$NOTES_LOG_FILE"
+
+    hamr_test form --data '{"title": "Renamed", "content": ""}' --context "__edit__:note_1" > /dev/null
+
+    assert_eq "$(get_log_count)" "0"
+    assert_eq "$(jq '.notes | length' "$NOTES_FILE")" "2"
+    assert_contains "$(get_notes_file)" "Renamed"
+}
+
 test_delete_returns_to_list() {
     local notes='{"notes": [
         {"id": "note_1", "title": "Delete me", "content": "Content", "created": 1000, "updated": 1000},
@@ -439,7 +531,7 @@ test_action_copy_executes() {
     local notes='{"notes": [{"id": "note_1", "title": "Test Note", "content": "Test content", "created": 1000, "updated": 1000}]}'
     set_notes "$notes"
     
-    # Create a temporary mock wl-copy that accepts arguments (note: real wl-copy takes stdin)
+    # Create a temporary mock wl-copy (the handler pipes the note to its stdin)
     # This prevents the handler from hanging trying to use the real wl-copy
     local mock_dir=$(mktemp -d)
     local mock_wl_copy="$mock_dir/wl-copy"
@@ -569,6 +661,23 @@ test_info_items_not_actionable() {
     assert_ok true
 }
 
+test_daemon_answers_one_line_per_request() {
+    local notes='{"notes": [{"id": "note_1", "title": "First", "content": "Content", "created": 1000, "updated": 1000}]}'
+    set_notes "$notes"
+    local output=$(printf '%s\n' \
+        '{"step": "initial"}' \
+        '{"step": "action", "selected": {"id": "__empty__"}}' \
+        '{"step": "form", "context": "__add__", "formData": {"title": "Second", "content": ""}}' \
+        '{"step": "initial"}' \
+        | HAMR_TEST_MODE=1 "$HANDLER" --daemon)
+
+    assert_eq "$(echo "$output" | wc -l)" "4"
+    assert_result_count "$(echo "$output" | sed -n 1p)" 1
+    assert_eq "$(echo "$output" | sed -n 2p)" ""
+    assert_result_count "$(echo "$output" | sed -n 3p)" 2
+    assert_result_count "$(echo "$output" | sed -n 4p)" 2
+}
+
 # ============================================================================
 # Run
 # ============================================================================
@@ -577,8 +686,10 @@ run_tests \
     test_initial_empty \
     test_initial_with_notes \
     test_initial_notes_sorted_by_updated_desc \
+    test_edited_note_moves_to_top \
     test_search_filters_by_title \
     test_search_filters_by_content \
+    test_search_as_you_type_matches_full_search \
     test_search_empty_query_shows_all \
     test_search_shows_quick_add \
     test_search_with_query_hides_add_button \
@@ -606,6 +717,8 @@ run_tests \
     test_edit_updates_timestamp \
     test_edit_requires_title \
     test_action_delete_removes_note \
+    test_changes_are_appended_to_log \
+    test_large_log_is_compacted \
     test_delete_returns_to_list \
     test_action_copy_executes \
     test_action_back_from_card \
@@ -617,4 +730,5 @@ run_tests \
     test_nonexistent_note_error \
     test_form_cancel_returns_to_list \
     test_input_mode_realtime \
-    test_info_items_not_actionable
+    test_info_items_not_actionable \
+    test_daemon_answers_one_line_per_request
@@ -2,41 +2,75 @@
 """
 Pictures workflow handler - searches for images in ~/Downloads/
 Demonstrates multi-turn workflow: browse -> select -> actions
+
+python-orjson is used for faster JSON encoding when installed (optional).
 """
 
+import heapq
 import json
+import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 
+# Optional orjson for faster response encoding
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 DOWNLOADS_DIR = Path.home() / "Downloads"
-IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".webp", ".bmp", ".svg"}
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".webp", ".bmp", ".svg")
+MAX_RESULTS = 50
+
+# Shared by every image row
+PREVIEW_ACTIONS = [
+    {"id": "open", "name": "Open", "icon": "open_in_new"},
+    {"id": "copy-path", "name": "Copy Path", "icon": "content_copy"},
+    {"id": "copy-image", "name": "Copy Image", "icon": "image"},
+]
+IMAGE_ACTIONS = [
+    {"id": "open", "name": "Open", "icon": "open_in_new"},
+    {"id": "copy-path", "name": "Copy Path", "icon": "content_copy"},
+]
 
 
 def find_images(query: str = "") -> list[dict]:
     """Find images in Downloads folder, optionally filtered by query"""
-    images = []
-
     if not DOWNLOADS_DIR.exists():
-        return images
-
-    for file in DOWNLOADS_DIR.iterdir():
-        if file.is_file() and file.suffix.lower() in IMAGE_EXTENSIONS:
-            if not query or query.lower() in file.name.lower():
-                images.append(
-                    {
-                        "id": str(file),
-                        "name": file.name,
-                        "path": str(file),
-                        "size": file.stat().st_size,
-                        "mtime": file.stat().st_mtime,
-                    }
-                )
-
-    # Sort by modification time (newest first)
-    images.sort(key=lambda x: x["mtime"], reverse=True)
-    return images[:50]  # Limit to 50 results
+        return []
+
+    query = query.lower()
+    matches = []
+
+    # scandir entries answer is_file() and cache stat() without extra syscalls
+    with os.scandir(DOWNLOADS_DIR) as entries:
+        for entry in entries:
+            name = entry.name.lower()
+            if not name.endswith(IMAGE_EXTENSIONS) or not entry.is_file():
+                continue
+            if not query or query in name:
+                matches.append(entry)
+
+    # Newest first; only the ones shown are ranked and turned into dicts
+    newest = heapq.nlargest(MAX_RESULTS, matches, key=lambda e: e.stat().st_mtime)
 
+    images = []
+    for entry in newest:
+        st = entry.stat()
+        images.append(
+            {
+                "id": entry.path,
+                "name": entry.name,
+                "path": entry.path,
+                "size": st.st_size,
+                "mtime": st.st_mtime,
+            }
+        )
+    return images
 
+
+@lru_cache(maxsize=1024)
 def format_size(size: float) -> str:
     """Format file size in human readable format"""
     for unit in ["B", "KB", "MB", "GB"]:
@@ -48,35 +82,31 @@ def format_size(size: float) -> str:
 
 def get_image_list_results(images: list[dict]) -> list[dict]:
     """Convert images to result format for browsing"""
-    return [
-        {
-            "id": img["id"],
-            "name": img["name"],
-            "description": format_size(img["size"]),
-            "icon": "image",
-            "thumbnail": img["path"],
-            "preview": {
-                "type": "image",
-                "content": img["path"],
-                "title": img["name"],
-                "metadata": [
-                    {"label": "Size", "value": format_size(img["size"])},
-                    {"label": "Path", "value": img["path"]},
-                ],
-                "actions": [
-                    {"id": "open", "name": "Open", "icon": "open_in_new"},
-                    {"id": "copy-path", "name": "Copy Path", "icon": "content_copy"},
-                    {"id": "copy-image", "name": "Copy Image", "icon": "image"},
-                ],
-                "detachable": True,
-            },
-            "actions": [
-                {"id": "open", "name": "Open", "icon": "open_in_new"},
-                {"id": "copy-path", "name": "Copy Path", "icon": "content_copy"},
-            ],
-        }
-        for img in images
-    ]
+    results = []
+    for img in images:
+        size = format_size(img["size"])
+        results.append(
+            {
+                "id": img["id"],
+                "name": img["name"],
+                "description": size,
+                "icon": "image",
+                "thumbnail": img["path"],
+                "preview": {
+                    "type": "image",
+                    "content": img["path"],
+                    "title": img["name"],
+                    "metadata": [
+                        {"label": "Size", "value": size},
+                        {"label": "Path", "value": img["path"]},
+                    ],
+                    "actions": PREVIEW_ACTIONS,
+                    "detachable": True,
+                },
+                "actions": IMAGE_ACTIONS,
+            }
+        )
+    return results
 
 
 def get_image_detail_results(image_path: str) -> list[dict]:
@@ -106,8 +136,26 @@ def get_image_detail_results(image_path: str) -> list[dict]:
     ]
 
 
-def main():
-    input_data = json.load(sys.stdin)
+def json_loads(data: str | bytes):
+    """Parse JSON with orjson when available"""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj) -> bytes:
+    """Serialize to compact UTF-8 JSON with orjson when available"""
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def emit(response: dict):
+    """Write a JSON response to stdout as one pre-encoded write"""
+    sys.stdout.buffer.write(json_dumps(response))
+
+
+def handle(input_data: dict):
     step = input_data.get("step", "initial")
     query = input_data.get("query", "").strip()
     selected = input_data.get("selected", {})
@@ -116,17 +164,13 @@ def main():
     if step == "initial":
         images = find_images()
         results = get_image_list_results(images)
-        print(
-            json.dumps({"type": "results", "results": results, "inputMode": "realtime"})
-        )
+        emit({"type": "results", "results": results, "inputMode": "realtime"})
         return
 
     if step == "search":
         images = find_images(query)
         results = get_image_list_results(images)
-        print(
-            json.dumps({"type": "results", "results": results, "inputMode": "realtime"})
-        )
+        emit({"type": "results", "results": results, "inputMode": "realtime"})
         return
 
     # Action: handle item click or action button
@@ -137,51 +181,45 @@ def main():
         if item_id == "__back__":
             images = find_images()
             results = get_image_list_results(images)
-            print(
-                json.dumps(
-                    {
-                        "type": "results",
-                        "results": results,
-                        "navigateBack": True,  # Going back to list
-                    }
-                )
+            emit(
+                {
+                    "type": "results",
+                    "results": results,
+                    "navigateBack": True,  # Going back to list
+                }
             )
             return
 
         # Action button clicks (open, copy-path from list view)
         if action == "open":
             filename = Path(item_id).name
-            print(
-                json.dumps(
-                    {
-                        "type": "execute",
-                        "execute": {
-                            "command": ["xdg-open", item_id],
-                            "name": f"Open {filename}",
-                            "icon": "image",
-                            "thumbnail": item_id,
-                            "close": True,
-                        },
-                    }
-                )
+            emit(
+                {
+                    "type": "execute",
+                    "execute": {
+                        "command": ["xdg-open", item_id],
+                        "name": f"Open {filename}",
+                        "icon": "image",
+                        "thumbnail": item_id,
+                        "close": True,
+                    },
+                }
             )
             return
 
         if action == "copy-path":
             filename = Path(item_id).name
-            print(
-                json.dumps(
-                    {
-                        "type": "execute",
-                        "execute": {
-                            "command": ["wl-copy", item_id],
-                            "notify": f"Copied: {item_id}",
-                            "name": f"Copy path: {filename}",
-                            "icon": "content_copy",
-                            "close": True,
-                        },
-                    }
-                )
+            emit(
+                {
+                    "type": "execute",
+                    "execute": {
+                        "command": ["wl-copy", item_id],
+                        "notify": f"Copied: {item_id}",
+                        "name": f"Copy path: {filename}",
+                        "icon": "content_copy",
+                        "close": True,
+                    },
+                }
             )
             return
 
@@ -189,94 +227,110 @@ def main():
         if item_id.startswith("open:"):
             path = item_id.split(":", 1)[1]
             filename = Path(path).name
-            print(
-                json.dumps(
-                    {
-                        "type": "execute",
-                        "execute": {
-                            "command": ["xdg-open", path],
-                            "name": f"Open {filename}",
-                            "icon": "image",
-                            "thumbnail": path,
-                            "close": True,
-                        },
-                    }
-                )
+            emit(
+                {
+                    "type": "execute",
+                    "execute": {
+                        "command": ["xdg-open", path],
+                        "name": f"Open {filename}",
+                        "icon": "image",
+                        "thumbnail": path,
+                        "close": True,
+                    },
+                }
             )
             return
 
         if item_id.startswith("copy-path:"):
             path = item_id.split(":", 1)[1]
             filename = Path(path).name
-            print(
-                json.dumps(
-                    {
-                        "type": "execute",
-                        "execute": {
-                            "command": ["wl-copy", path],
-                            "notify": f"Copied: {path}",
-                            "name": f"Copy path: {filename}",
-                            "icon": "content_copy",
-                            "close": True,
-                        },
-                    }
-                )
+            emit(
+                {
+                    "type": "execute",
+                    "execute": {
+                        "command": ["wl-copy", path],
+                        "notify": f"Copied: {path}",
+                        "name": f"Copy path: {filename}",
+                        "icon": "content_copy",
+                        "close": True,
+                    },
+                }
             )
             return
 
         if item_id.startswith("copy-image:"):
             path = item_id.split(":", 1)[1]
             filename = Path(path).name
-            print(
-                json.dumps(
-                    {
-                        "type": "execute",
-                        "execute": {
-                            "command": ["wl-copy", "-t", "image/png", path],
-                            "notify": "Image copied to clipboard",
-                            "name": f"Copy image: {filename}",
-                            "icon": "image",
-                            "thumbnail": path,
-                            "close": True,
-                        },
-                    }
-                )
+            emit(
+                {
+                    "type": "execute",
+                    "execute": {
+                        "command": ["wl-copy", "-t", "image/png", path],
+                        "notify": "Image copied to clipboard",
+                        "name": f"Copy image: {filename}",
+                        "icon": "image",
+                        "thumbnail": path,
+                        "close": True,
+                    },
+                }
             )
             return
 
         if item_id.startswith("delete:"):
             path = item_id.split(":", 1)[1]
-            print(
-                json.dumps(
-                    {
-                        "type": "execute",
-                        "execute": {
-                            "command": ["gio", "trash", path],
-                            "notify": f"Moved to trash: {Path(path).name}",
-                            "close": True,
-                        },
-                    }
-                )
+            emit(
+                {
+                    "type": "execute",
+                    "execute": {
+                        "command": ["gio", "trash", path],
+                        "notify": f"Moved to trash: {Path(path).name}",
+                        "close": True,
+                    },
+                }
             )
             return
 
         # Default click on image - show detail view (multi-turn!)
         if Path(item_id).exists():
             results = get_image_detail_results(item_id)
-            print(
-                json.dumps(
-                    {
-                        "type": "results",
-                        "results": results,
-                        "inputMode": "realtime",
-                        "navigateForward": True,  # Drilling into image detail
-                    }
-                )
+            emit(
+                {
+                    "type": "results",
+                    "results": results,
+                    "inputMode": "realtime",
+                    "navigateForward": True,  # Drilling into image detail
+                }
             )
             return
 
         # Unknown action
-        print(json.dumps({"type": "error", "message": f"Unknown action: {item_id}"}))
+        emit({"type": "error", "message": f"Unknown action: {item_id}"})
+
+
+def serve():
+    """Answer newline-delimited JSON requests until stdin closes.
+
+    Every request gets exactly one response line (empty if the step has
+    no output) so the launcher can match replies to requests.
+    """
+    for line in sys.stdin.buffer:
+        if not line.strip():
+            continue
+        try:
+            handle(json_loads(line))
+        except Exception as e:
+            emit({"type": "error", "message": str(e)})
+        sys.stdout.buffer.write(b"\n")
+        sys.stdout.buffer.flush()
+
+
+def main():
+    if "--daemon" in sys.argv[1:]:
+        serve()
+        return
+    raw = sys.stdin.buffer.read()
+    handle(json_loads(raw) if raw.strip() else {})
+    sys.stdout.buffer.flush()
 
 
 if __name__ == "__main__":
@@ -403,6 +403,32 @@ test_handles_missing_downloads_gracefully() {
     assert_ok hamr_test initial
 }
 
+test_daemon_answers_one_line_per_request() {
+    local image_id=$(hamr_test initial | jq -r '.results[0].id')
+    local output=$(printf '%s\n' \
+        '{"step": "initial"}' \
+        '{"step": "search", "query": "photo"}' \
+        "{\"step\": \"action\", \"selected\": {\"id\": \"$image_id\"}, \"action\": \"open\"}" \
+        | "$HANDLER" --daemon)
+
+    assert_eq "$(echo "$output" | wc -l)" "3"
+    assert_result_count "$(echo "$output" | sed -n 1p)" 5
+    assert_result_count "$(echo "$output" | sed -n 2p)" 2
+    assert_type "$(echo "$output" | sed -n 3p)" "execute"
+}
+
+test_daemon_pairs_back_to_back_searches() {
+    local queries=(s sc scr scre zzz)
+    local output=$(for q in "${queries[@]}"; do
+        printf '{"step": "search", "query": "%s"}\n' "$q"
+    done | "$HANDLER" --daemon)
+    local expected=$(for q in "${queries[@]}"; do
+        hamr_test search --query "$q" | jq -c '[.results[].id]'
+    done)
+
+    assert_eq "$(echo "$output" | jq -c '[.results[].id]')" "$expected"
+}
+
 # ============================================================================
 # Run
 # ============================================================================
@@ -435,4 +461,6 @@ run_tests \
     test_open_action_has_thumbnail \
     test_copy_path_shows_notification \
     test_all_responses_valid_json \
-    test_handles_missing_downloads_gracefully
+    test_handles_missing_downloads_gracefully \
+    test_daemon_answers_one_line_per_request \
+    test_daemon_pairs_back_to_back_searches
@@ -20,9 +20,7 @@ QUICKLINKS_PATH = Path.home() / ".config/hamr/quicklinks.json"
 
 
 def load_quicklinks() -> list[dict]:
-    """Load quicklinks from config file"""
-    if not QUICKLINKS_PATH.exists():
-        return []
+    """Load quicklinks from config file (a missing file means no quicklinks)"""
     try:
         with open(QUICKLINKS_PATH) as f:
             data = json.load(f)
@@ -776,6 +776,7 @@ Singleton {
          // In replay mode, don't kill the process - let it complete for notification
          if (!root.replayMode) {
              pluginProcess.running = false;
+             daemonProcess.stop();
          }
          root.activePlugin = null;
          root.pluginResults = [];
@@ -995,6 +996,16 @@ Singleton {
          
          const inputJson = JSON.stringify(input);
          
+         // Daemon plugins stay running and answer one JSON line per request
+         if (root.activePlugin.manifest.daemon) {
+             if (daemonProcess.pluginId !== root.activePlugin.id
+                     || (!daemonProcess.running && daemonProcess.queued === null)) {
+                 daemonProcess.launch(root.activePlugin, handlerPath);
+             }
+             daemonProcess.send(inputJson, input.step);
+             return;
+         }
+         
         // Use bash to pipe input to handler - language-agnostic (relies on shebang)
         pluginProcess.running = false;
         pluginProcess.workingDirectory = root.activePlugin.path;
@@ -1330,6 +1341,117 @@ Singleton {
          }
      }
      
+     // Long-lived handler for plugins with "daemon": true in manifest
+     // Requests and responses are newline-delimited JSON over stdin/stdout,
+     // answered strictly in order, one line per request
+     Process {
+         id: daemonProcess
+         property string pluginId: ""
+         // Requests written before the process has started, null once it runs
+         property var queued: null
+         // Steps of the requests still waiting for a response, oldest first
+         property var inFlight: []
+         // Set while an old handler is shutting down, so no second one starts
+         property bool stopping: false
+         stdinEnabled: true
+         
+         // Switch to a plugin's handler. A previous handler is stopped first
+         // and the new one is started from onExited, so requests never reach
+         // the old process and the two never overlap.
+         function launch(plugin, handlerPath) {
+             pluginId = plugin.id;
+             workingDirectory = plugin.path;
+             command = [handlerPath, "--daemon"];
+             queued = [];
+             inFlight = [];
+             if (running || stopping) {
+                 stopping = true;
+                 running = false;
+             } else {
+                 running = true;
+             }
+         }
+         
+         function send(line, step) {
+             inFlight.push(step);
+             if (queued !== null) {
+                 queued.push(line);
+             } else {
+                 write(line + "\n");
+             }
+         }
+         
+         function stop() {
+             pluginId = "";
+             queued = null;
+             inFlight = [];
+             if (running) {
+                 stopping = true;
+                 running = false;
+             }
+         }
+         
+         onStarted: {
+             const lines = queued ?? [];
+             queued = null;
+             for (const line of lines) write(line + "\n");
+         }
+         
+         stdout: SplitParser {
+             onRead: data => {
+                 // Late output of a handler that is being replaced or stopped
+                 if (daemonProcess.stopping || daemonProcess.queued !== null) return;
+                 
+                 // Search and poll responses are stale once a newer one is pending
+                 const step = daemonProcess.inFlight.shift();
+                 const isRefresh = s => s === "search" || s === "poll";
+                 if (isRefresh(step) && daemonProcess.inFlight.some(isRefresh)) return;
+                 
+                 root.pluginBusy = daemonProcess.inFlight.length > 0;
+                 const wasReplayMode = root.replayMode;
+                 root.replayMode = false;
+                 root.replayPluginInfo = null;
+                 
+                 // Empty line: the handler had nothing to say for this request
+                 const output = data.trim();
+                 if (output) {
+                     try {
+                         const response = JSON.parse(output);
+                         root.handlePluginResponse(response, wasReplayMode);
+                     } catch (e) {
+                         root.pluginError = `Failed to parse plugin output: ${e}`;
+                         console.warn(`[PluginRunner] Parse error: ${e}, output: ${output}`);
+                     }
+                 }
+                 
+                 // A replayed action is a one-off, don't keep its handler resident
+                 if (wasReplayMode) daemonProcess.stop();
+             }
+         }
+         
+         stderr: SplitParser {
+             onRead: data => console.warn(`[PluginRunner] daemon stderr: ${data}`)
+         }
+         
+         onExited: (exitCode, exitStatus) => {
+             const wasStopping = daemonProcess.stopping;
+             daemonProcess.stopping = false;
+             // The next plugin's handler was waiting for this one to exit
+             if (wasStopping && daemonProcess.queued !== null) {
+                 daemonProcess.running = true;
+                 return;
+             }
+             const wasAnswering = daemonProcess.inFlight.length > 0;
+             daemonProcess.pluginId = "";
+             daemonProcess.queued = null;
+             daemonProcess.inFlight = [];
+             if (exitCode !== 0 && wasAnswering) {
+                 root.pluginBusy = false;
+                 root.pluginError = `Plugin exited with code ${exitCode}`;
+             }
+         }
+     }
+     
      // Prepared plugins for fuzzy search
      property var preppedPlugins: plugins
          .filter(w => w.manifest)